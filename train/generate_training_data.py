@@ -23,6 +23,7 @@ Options:
     --difficulty N: Filter to include only samples with difficulty >= N
     --category CAT: Filter to include only samples matching category prefix
     --seed N: Random seed for reproducibility (default: 42)
+    --workers N: Worker processes for extension/HTTP patterns (default: 1)
 """
 
 import os
@@ -37,6 +38,11 @@ from pathlib import Path
 from typing import List, Dict, Any, Tuple, Optional, Set
 from dataclasses import dataclass
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -659,6 +665,8 @@ def main():
                        help='Filter by category prefix')
     parser.add_argument('--seed', type=int, default=42,
                        help='Random seed')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Worker processes for extension/HTTP pattern generation')
 
     args = parser.parse_args()
     random.seed(args.seed)
@@ -719,16 +727,26 @@ def main():
 
     # Step 4: Generate extension pattern data
     print(f"\n4. Generating extension patterns ({args.extension_samples:,} samples)...")
-    ext_generator = ExtensionPatternGenerator()
-    extension_data = ext_generator.generate_samples(args.extension_samples)
+    ext_generator = ExtensionPatternGenerator(seed=args.seed)
+    if args.workers > 1:
+        extension_data = ext_generator.generate_samples_parallel(
+            args.extension_samples, workers=args.workers, seed=args.seed
+        )
+    else:
+        extension_data = ext_generator.generate_samples(args.extension_samples)
     extension_data = filter_samples(extension_data, args.difficulty, args.category)
     print(f"   Generated {len(extension_data):,} extension pattern samples")
     all_data.extend(extension_data)
 
     # Step 5: Generate HTTP pattern data
     print(f"\n5. Generating HTTP patterns ({args.http_samples:,} samples)...")
-    http_generator = HTTPPatternGenerator()
-    http_data = http_generator.generate_samples(args.http_samples)
+    http_generator = HTTPPatternGenerator(seed=args.seed)
+    if args.workers > 1:
+        http_data = http_generator.generate_samples_parallel(
+            args.http_samples, workers=args.workers, seed=args.seed
+        )
+    else:
+        http_data = http_generator.generate_samples(args.http_samples)
     http_data = filter_samples(http_data, args.difficulty, args.category)
     print(f"   Generated {len(http_data):,} HTTP pattern samples")
     all_data.extend(http_data)
@@ -746,9 +764,14 @@ def main():
 
     # Write output
     print(f"\n8. Writing to {output_path}...")
-    with open(output_path, 'w') as f:
-        for sample in all_data:
-            f.write(json.dumps(sample) + '\n')
+    if orjson is not None:
+        with open(output_path, 'wb') as f:
+            for sample in all_data:
+                f.write(orjson.dumps(sample, option=orjson.OPT_APPEND_NEWLINE))
+    else:
+        with open(output_path, 'w') as f:
+            for sample in all_data:
+                f.write(json.dumps(sample) + '\n')
 
     # Summary
     print("\n" + "=" * 70)
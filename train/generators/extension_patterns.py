@@ -27,16 +27,51 @@ Extension ID Reference:
   400-407: Compression (gzip_compress=402, gzip_decompress=403)
   420-429: Encoding (base64_encode=420, base64_decode=421, url_encode=424, url_decode=425)
   500-509: TLS (connect=500, write=501, read=502, close=503)
+
+Packed Instruction Format:
+  Each instruction packs to a fixed INSTR_SIZE-byte little-endian record:
+  opcode, mode, rd, rs1, rs2, has_imm (u8 each) followed by imm (i32).
+
+    offset  size  field
+    0       1     opcode
+    1       1     mode
+    2       1     rd
+    3       1     rs1
+    4       1     rs2
+    5       1     has_imm
+    6       4     imm (signed, little-endian, unaligned)
+
+  Records are unpadded, so native readers can map a buffer directly onto
+  `#[repr(C, packed)]` (Rust) or `#pragma pack(1)` (C) structs. Batches from
+  generate_packed_batch() are columnar: one buffer of count * slots records
+  (zero-filled past each sample's end) plus a u8 n_instr column.
+  write_packed() stores a batch as records of u16 prompt length, UTF-8
+  prompt, u8 instruction count and the packed instructions.
 """
 
+import itertools
+import os
 import random
-from typing import List, Dict, Tuple, Optional
+import struct
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Optional, Sequence
 from dataclasses import dataclass
 
 
+INSTR_STRUCT = struct.Struct('<6Bi')
+INSTR_SIZE = INSTR_STRUCT.size
+
+PROMPT_LEN_STRUCT = struct.Struct('<H')
+N_INSTR_STRUCT = struct.Struct('<B')
+
+
 @dataclass
 class Instruction:
     """Instruction representation for training data."""
+    __slots__ = ('opcode', 'mode', 'rd', 'rs1', 'rs2', 'has_imm', 'imm')
+
     opcode: int
     mode: int
     rd: int
@@ -57,6 +92,33 @@ class Instruction:
             'imm_bin': self.imm if self.has_imm else 0,
         }
 
+    def pack(self) -> bytes:
+        return INSTR_STRUCT.pack(
+            self.opcode, self.mode, self.rd, self.rs1, self.rs2, self.has_imm, self.imm
+        )
+
+
+def _intern_prompts(templates: Tuple[str, ...], **fields) -> Tuple[str, ...]:
+    """Format prompt templates and intern the results."""
+    return tuple(sys.intern(t.format(**fields)) for t in templates)
+
+
+def pack_instructions(instructions: List[Instruction]) -> bytes:
+    """Pack instructions into a contiguous buffer of INSTR_SIZE-byte records."""
+    pack_into = INSTR_STRUCT.pack_into
+    buf = bytearray(len(instructions) * INSTR_SIZE)
+    pos = 0
+    for instr in instructions:
+        pack_into(buf, pos, instr.opcode, instr.mode, instr.rd, instr.rs1,
+                  instr.rs2, instr.has_imm, instr.imm)
+        pos += INSTR_SIZE
+    return bytes(buf)
+
+
+def unpack_instructions(data: bytes) -> List[Instruction]:
+    """Decode a packed instruction buffer back into Instruction objects."""
+    return [Instruction(*fields) for fields in INSTR_STRUCT.iter_unpack(data)]
+
 
 # Extension IDs
 EXT_SHA256 = 1
@@ -142,8 +204,10 @@ class ExtensionPatternGenerator:
     BR_LT = 2
     BR_GE = 3
 
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         """Initialize generator with pattern definitions."""
+        self._rng = random.Random(seed)
+
         # Pattern definitions: (weight, generator_function)
         self.patterns = [
             # Crypto patterns (high weight - common operations)
@@ -176,6 +240,7 @@ class ExtensionPatternGenerator:
 
             # TLS patterns
             (6, self.gen_tls_secure_pattern),
+            (4, self.gen_tls_pipelined_pattern),
 
             # UUID patterns
             (4, self.gen_uuid_pattern),
@@ -184,20 +249,133 @@ class ExtensionPatternGenerator:
         # Compute normalized weights
         total = sum(p[0] for p in self.patterns)
         self.weights = [p[0] / total for p in self.patterns]
+        self._pattern_fns = [p[1] for p in self.patterns]
+        self._cum_weights = list(itertools.accumulate(self.weights))
+
+        # Prebuilt templates for patterns whose operands are all literal
+        # constants; these tuples are shared between samples, so callers must
+        # not mutate the instructions they return
+        self._tls_template = (
+            self._mov(0, 0x1000),          # r0 = hostname ptr
+            self._mov(1, 443),             # r1 = port
+            self._ext_call(EXT_TLS_CONNECT, 0, 1, 0),  # connect -> r0 = handle
+            self._mov_reg(5, 0),           # r5 = tls handle
+            self._mov(1, 0x2000),          # r1 = data to send
+            self._mov(2, 256),             # r2 = data length
+            self._ext_call(EXT_TLS_WRITE, 5, 1, 2),  # write
+            self._mov(1, 0x3000),          # r1 = receive buffer
+            self._mov(2, 4096),            # r2 = buffer size
+            self._ext_call(EXT_TLS_READ, 5, 1, 2),  # read -> r0 = bytes read
+            self._mov_reg(6, 0),           # r6 = bytes read
+            self._mov_reg(0, 5),           # r0 = handle
+            self._ext_call(EXT_TLS_CLOSE, 0, 0, 0),  # close
+            self._mov_reg(0, 6),           # return bytes read
+            self._halt(),
+        )
+        self._uuid_template = (
+            self._mov(0, 0x1000),          # r0 = output buffer (36 bytes)
+            self._ext_call(EXT_UUID_V4, 0, 0, 0),  # generate uuid
+            self._halt(),
+        )
+        self._tls_pipelined_templates = {k: self._build_tls_pipelined(k) for k in range(2, 9)}
+
+        # Prompt tables, formatted and interned once so every sample shares
+        # the same string objects; parameterized prompts are keyed by variant
+        self._prompts_hash = {
+            ext_id: _intern_prompts(self.HASH_PROMPTS, name=name, full_name=full_name)
+            for ext_id, name, full_name, _ in self.HASH_TYPES
+        }
+        self._prompts_hmac = {
+            ext_id: _intern_prompts(self.HMAC_PROMPTS, name=name, full_name=full_name)
+            for ext_id, name, full_name in self.HMAC_TYPES
+        }
+        self._prompts_json_field = {
+            field: _intern_prompts(self.JSON_FIELD_PROMPTS, type_name=type_name, field=field)
+            for _, type_name, *fields in self.JSON_FIELD_TYPES
+            for field in fields
+        }
+        self._prompts_http_get = {
+            resource: _intern_prompts(self.HTTP_GET_PROMPTS, resource=resource)
+            for resource in self.HTTP_GET_RESOURCES
+        }
+        self._prompts_http_post = {
+            resource: _intern_prompts(self.HTTP_POST_PROMPTS, resource=resource)
+            for resource in self.HTTP_POST_RESOURCES
+        }
+        self._prompts_sqlite_query = {
+            table: _intern_prompts(self.SQLITE_QUERY_PROMPTS, table=table)
+            for table in self.SQLITE_TABLES
+        }
+        self._prompts_tls_pipelined = {
+            k: _intern_prompts(self.TLS_PIPELINED_PROMPTS, k=k)
+            for k in range(2, 9)
+        }
+        self._prompts_sign = _intern_prompts(self.SIGN_PROMPTS)
+        self._prompts_verify = _intern_prompts(self.VERIFY_PROMPTS)
+        self._prompts_encrypt = _intern_prompts(self.ENCRYPT_PROMPTS)
+        self._prompts_decrypt = _intern_prompts(self.DECRYPT_PROMPTS)
+        self._prompts_password_hash = _intern_prompts(self.PASSWORD_HASH_PROMPTS)
+        self._prompts_json_build = _intern_prompts(self.JSON_BUILD_PROMPTS)
+        self._prompts_json_array = _intern_prompts(self.JSON_ARRAY_PROMPTS)
+        self._prompts_http_headers = _intern_prompts(self.HTTP_HEADERS_PROMPTS)
+        self._prompts_sqlite_transaction = _intern_prompts(self.SQLITE_TRANSACTION_PROMPTS)
+        self._prompts_base64_encode = _intern_prompts(self.BASE64_ENCODE_PROMPTS)
+        self._prompts_base64_decode = _intern_prompts(self.BASE64_DECODE_PROMPTS)
+        self._prompts_url_encode = _intern_prompts(self.URL_ENCODE_PROMPTS)
+        self._prompts_url_decode = _intern_prompts(self.URL_DECODE_PROMPTS)
+        self._prompts_gzip_compress = _intern_prompts(self.GZIP_COMPRESS_PROMPTS)
+        self._prompts_gzip_decompress = _intern_prompts(self.GZIP_DECOMPRESS_PROMPTS)
+        self._prompts_tls = _intern_prompts(self.TLS_PROMPTS)
+        self._prompts_uuid = _intern_prompts(self.UUID_PROMPTS)
 
     def generate(self) -> Tuple[str, List[Instruction]]:
         """Generate a single training sample."""
-        idx = random.choices(range(len(self.patterns)), weights=self.weights)[0]
-        return self.patterns[idx][1]()
+        return self._rng.choices(self._pattern_fns, cum_weights=self._cum_weights)[0]()
+
+    def _draw_patterns(self, count: int) -> List:
+        """Draw pattern generator functions for a whole batch in one call."""
+        return self._rng.choices(self._pattern_fns, cum_weights=self._cum_weights, k=count)
+
+    def generate_packed(self) -> Tuple[str, bytes]:
+        """Generate a single sample with its instructions packed to bytes."""
+        prompt, instructions = self.generate()
+        return prompt, pack_instructions(instructions)
+
+    def generate_packed_batch(self, count: int, slots: int = 64) -> Dict:
+        """Generate many samples as fixed-stride columns.
+
+        Returns ``{'context': [str], 'instructions': bytearray, 'n_instr':
+        array('B')}``. Sample i owns ``slots`` records starting at byte
+        ``i * slots * INSTR_SIZE``; the first ``n_instr[i]`` are real
+        instructions and the rest stay zeroed.
+        """
+        pack_into = INSTR_STRUCT.pack_into
+        stride = slots * INSTR_SIZE
+        buf = bytearray(count * stride)
+        n_instr = array('B', bytes(count))
+        prompts = []
+        append = prompts.append
+        for i, fn in enumerate(self._draw_patterns(count)):
+            prompt, instructions = fn()
+            append(prompt)
+            pos = i * stride
+            for instr in instructions[:slots]:
+                pack_into(buf, pos, instr.opcode, instr.mode, instr.rd, instr.rs1,
+                          instr.rs2, instr.has_imm, instr.imm)
+                pos += INSTR_SIZE
+            n_instr[i] = min(len(instructions), slots)
+        return {'context': prompts, 'instructions': buf, 'n_instr': n_instr}
 
     def generate_samples(self, count: int) -> List[Dict]:
         """Generate multiple training samples."""
         samples = []
-        for _ in range(count):
-            prompt, instructions = self.generate()
-            samples.append({
+        append, pad = samples.append, self._pad_instructions
+        for fn in self._draw_patterns(count):
+            prompt, instructions = fn()
+            append({
                 'context': prompt,
-                'instructions': self._pad_instructions(instructions),
+                'instructions': pad(instructions),
+                'valid_count': min(len(instructions), 64),
                 'metadata': {
                     'category': 'extension-patterns',
                     'source': 'synthetic-extension',
@@ -205,6 +383,28 @@ class ExtensionPatternGenerator:
             })
         return samples
 
+    def generate_samples_parallel(self, count: int, workers: Optional[int] = None,
+                                  seed: Optional[int] = None) -> List[Dict]:
+        """Generate multiple training samples across worker processes.
+
+        Each worker builds its own generator with a distinct seed, derived from
+        ``seed`` when given so runs are reproducible for a fixed worker count.
+        """
+        workers = min(workers or os.cpu_count() or 1, max(count, 1))
+        if workers <= 1:
+            return self.generate_samples(count)
+
+        if seed is None:
+            seeder = random.SystemRandom()
+            seeds = [seeder.randrange(2**32) for _ in range(workers)]
+        else:
+            seeds = [seed + i for i in range(workers)]
+        chunks = [count // workers + (1 if i < count % workers else 0) for i in range(workers)]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_generate_chunk, chunks, seeds)
+            return list(itertools.chain.from_iterable(results))
+
     def _pad_instructions(self, instructions: List[Instruction], slots: int = 64) -> List[Dict]:
         """Pad instruction list to fixed slots."""
         result = [instr.to_dict() for instr in instructions]
@@ -263,25 +463,27 @@ class ExtensionPatternGenerator:
     # CRYPTO PATTERNS
     # ========================================================================
 
+    HASH_TYPES = (
+        (EXT_SHA256, 'sha256', 'SHA-256', 32),
+        (EXT_SHA384, 'sha384', 'SHA-384', 48),
+        (EXT_SHA512, 'sha512', 'SHA-512', 64),
+        (EXT_SHA3_256, 'sha3-256', 'SHA3-256', 32),
+        (EXT_SHA1, 'sha1', 'SHA-1', 20),
+    )
+    HASH_PROMPTS = (
+        "compute {name} hash of input buffer",
+        "hash data using {full_name}",
+        "calculate {name} digest of message",
+        "create {name} hash of input",
+        "generate {full_name} checksum",
+        "apply {name} to input data",
+    )
+
     def gen_hash_pattern(self) -> Tuple[str, List[Instruction]]:
         """Generate hash computation pattern."""
-        hash_types = [
-            (EXT_SHA256, 'sha256', 'SHA-256', 32),
-            (EXT_SHA384, 'sha384', 'SHA-384', 48),
-            (EXT_SHA512, 'sha512', 'SHA-512', 64),
-            (EXT_SHA3_256, 'sha3-256', 'SHA3-256', 32),
-            (EXT_SHA1, 'sha1', 'SHA-1', 20),
-        ]
-        ext_id, name, full_name, output_len = random.choice(hash_types)
-
-        prompts = [
-            f"compute {name} hash of input buffer",
-            f"hash data using {full_name}",
-            f"calculate {name} digest of message",
-            f"create {name} hash of input",
-            f"generate {full_name} checksum",
-            f"apply {name} to input data",
-        ]
+        ext_id = self._rng.choice(self.HASH_TYPES)[0]
+
+        prompts = self._prompts_hash[ext_id]
 
         instructions = [
             self._mov(0, 0x1000),          # r0 = input ptr
@@ -291,24 +493,26 @@ class ExtensionPatternGenerator:
             self._halt(),
         ]
 
-        return random.choice(prompts), instructions
+        return self._rng.choice(prompts), instructions
+
+    HMAC_TYPES = (
+        (EXT_HMAC_SHA256, 'hmac-sha256', 'HMAC-SHA256'),
+        (EXT_HMAC_SHA384, 'hmac-sha384', 'HMAC-SHA384'),
+        (EXT_HMAC_SHA512, 'hmac-sha512', 'HMAC-SHA512'),
+    )
+    HMAC_PROMPTS = (
+        "compute {name} of message with key",
+        "generate {full_name} authentication code",
+        "create {name} signature for data",
+        "calculate {name} MAC",
+        "authenticate message using {name}",
+    )
 
     def gen_hmac_pattern(self) -> Tuple[str, List[Instruction]]:
         """Generate HMAC computation pattern."""
-        hmac_types = [
-            (EXT_HMAC_SHA256, 'hmac-sha256', 'HMAC-SHA256'),
-            (EXT_HMAC_SHA384, 'hmac-sha384', 'HMAC-SHA384'),
-            (EXT_HMAC_SHA512, 'hmac-sha512', 'HMAC-SHA512'),
-        ]
-        ext_id, name, full_name = random.choice(hmac_types)
-
-        prompts = [
-            f"compute {name} of message with key",
-            f"generate {full_name} authentication code",
-            f"create {name} signature for data",
-            f"calculate {name} MAC",
-            f"authenticate message using {name}",
-        ]
+        ext_id = self._rng.choice(self.HMAC_TYPES)[0]
+
+        prompts = self._prompts_hmac[ext_id]
 
         instructions = [
             self._mov(0, 0x1000),          # r0 = message ptr
@@ -320,18 +524,26 @@ class ExtensionPatternGenerator:
             self._halt(),
         ]
 
-        return random.choice(prompts), instructions
+        return self._rng.choice(prompts), instructions
+
+    SIGN_PROMPTS = (
+        "sign message with ed25519 private key",
+        "create ed25519 signature for data",
+        "generate digital signature using ed25519",
+        "sign data with private key",
+    )
+    VERIFY_PROMPTS = (
+        "verify ed25519 signature on message",
+        "check digital signature validity",
+        "validate ed25519 signed data",
+        "verify signature with public key",
+    )
 
     def gen_sign_verify_pattern(self) -> Tuple[str, List[Instruction]]:
         """Generate sign/verify pattern (Ed25519)."""
-        if random.random() > 0.5:
+        if self._rng.random() > 0.5:
             # Sign
-            prompts = [
-                "sign message with ed25519 private key",
-                "create ed25519 signature for data",
-                "generate digital signature using ed25519",
-                "sign data with private key",
-            ]
+            prompts = self._prompts_sign
             instructions = [
                 self._mov(0, 0x1000),          # r0 = message ptr
                 self._mov(1, 64),              # r1 = message length
@@ -342,12 +554,7 @@ class ExtensionPatternGenerator:
             ]
         else:
             # Verify
-            prompts = [
-                "verify ed25519 signature on message",
-                "check digital signature validity",
-                "validate ed25519 signed data",
-                "verify signature with public key",
-            ]
+            prompts = self._prompts_verify
             instructions = [
                 self._mov(0, 0x1000),          # r0 = message ptr
                 self._mov(1, 64),              # r1 = message length
@@ -358,27 +565,30 @@ class ExtensionPatternGenerator:
                 self._halt(),
             ]
 
-        return random.choice(prompts), instructions
+        return self._rng.choice(prompts), instructions
+
+    ENCRYPT_PROMPTS = (
+        "encrypt data with aes-256-gcm",
+        "apply aes gcm encryption to plaintext",
+        "encrypt message using aes-256",
+        "secure data with aes-gcm encryption",
+    )
+    DECRYPT_PROMPTS = (
+        "decrypt aes-256-gcm ciphertext",
+        "apply aes gcm decryption",
+        "decrypt message using aes-256",
+        "recover plaintext from aes-gcm",
+    )
 
     def gen_encrypt_decrypt_pattern(self) -> Tuple[str, List[Instruction]]:
         """Generate encrypt/decrypt pattern (AES-GCM)."""
-        if random.random() > 0.5:
+        if self._rng.random() > 0.5:
             # Encrypt
-            prompts = [
-                "encrypt data with aes-256-gcm",
-                "apply aes gcm encryption to plaintext",
-                "encrypt message using aes-256",
-                "secure data with aes-gcm encryption",
-            ]
+            prompts = self._prompts_encrypt
             ext_id = EXT_AES_ENCRYPT
         else:
             # Decrypt
-            prompts = [
-                "decrypt aes-256-gcm ciphertext",
-                "apply aes gcm decryption",
-                "decrypt message using aes-256",
-                "recover plaintext from aes-gcm",
-            ]
+            prompts = self._prompts_decrypt
             ext_id = EXT_AES_DECRYPT
 
         instructions = [
@@ -391,17 +601,19 @@ class ExtensionPatternGenerator:
             self._halt(),
         ]
 
-        return random.choice(prompts), instructions
+        return self._rng.choice(prompts), instructions
+
+    PASSWORD_HASH_PROMPTS = (
+        "hash password with argon2id",
+        "securely hash user password",
+        "create password hash using argon2",
+        "generate password-based key derivation",
+        "hash password for storage",
+    )
 
     def gen_password_hash_pattern(self) -> Tuple[str, List[Instruction]]:
         """Generate password hashing pattern (Argon2id)."""
-        prompts = [
-            "hash password with argon2id",
-            "securely hash user password",
-            "create password hash using argon2",
-            "generate password-based key derivation",
-            "hash password for storage",
-        ]
+        prompts = self._prompts_password_hash
 
         instructions = [
             self._mov(0, 0x1000),          # r0 = password ptr
@@ -412,29 +624,31 @@ class ExtensionPatternGenerator:
             self._halt(),
         ]
 
-        return random.choice(prompts), instructions
+        return self._rng.choice(prompts), instructions
 
     # ========================================================================
     # JSON PATTERNS
     # ========================================================================
 
+    JSON_FIELD_TYPES = (
+        (EXT_JSON_GET_STRING, 'string', 'name', 'username', 'email'),
+        (EXT_JSON_GET_INT, 'integer', 'id', 'count', 'age'),
+        (EXT_JSON_GET_BOOL, 'boolean', 'active', 'enabled', 'valid'),
+    )
+    JSON_FIELD_PROMPTS = (
+        "parse json and extract {field} field",
+        "get {type_name} value from json key {field}",
+        "parse json object and read {field}",
+        "extract {field} from json string",
+        "decode json and get {field} value",
+    )
+
     def gen_json_parse_extract_pattern(self) -> Tuple[str, List[Instruction]]:
         """Generate JSON parse + extract pattern."""
-        field_types = [
-            (EXT_JSON_GET_STRING, 'string', 'name', 'username', 'email'),
-            (EXT_JSON_GET_INT, 'integer', 'id', 'count', 'age'),
-            (EXT_JSON_GET_BOOL, 'boolean', 'active', 'enabled', 'valid'),
-        ]
-        ext_get, type_name, *fields = random.choice(field_types)
-        field = random.choice(fields)
-
-        prompts = [
-            f"parse json and extract {field} field",
-            f"get {type_name} value from json key {field}",
-            f"parse json object and read {field}",
-            f"extract {field} from json string",
-            f"decode json and get {field} value",
-        ]
+        ext_get, _, *fields = self._rng.choice(self.JSON_FIELD_TYPES)
+        field = self._rng.choice(fields)
+
+        prompts = self._prompts_json_field[field]
 
         instructions = [
             self._mov(0, 0x1000),          # r0 = json string ptr
@@ -451,17 +665,19 @@ class ExtensionPatternGenerator:
             self._halt(),
         ]
 
-        return random.choice(prompts), instructions
+        return self._rng.choice(prompts), instructions
+
+    JSON_BUILD_PROMPTS = (
+        "build json object with fields",
+        "create json object and set properties",
+        "construct json response object",
+        "build json with id and name fields",
+        "create json object and stringify",
+    )
 
     def gen_json_build_pattern(self) -> Tuple[str, List[Instruction]]:
         """Generate JSON object building pattern."""
-        prompts = [
-            "build json object with fields",
-            "create json object and set properties",
-            "construct json response object",
-            "build json with id and name fields",
-            "create json object and stringify",
-        ]
+        prompts = self._prompts_json_build
 
         instructions = [
             self._ext_call(EXT_JSON_NEW, 0, 0, 0),  # new json object -> r0
@@ -481,17 +697,19 @@ class ExtensionPatternGenerator:
             self._halt(),
         ]
 
-        return random.choice(prompts), instructions
+        return self._rng.choice(prompts), instructions
+
+    JSON_ARRAY_PROMPTS = (
+        "iterate over json array elements",
+        "loop through json array",
+        "process each element in json array",
+        "parse json array and iterate items",
+        "read all items from json array",
+    )
 
     def gen_json_array_iterate_pattern(self) -> Tuple[str, List[Instruction]]:
         """Generate JSON array iteration pattern."""
-        prompts = [
-            "iterate over json array elements",
-            "loop through json array",
-            "process each element in json array",
-            "parse json array and iterate items",
-            "read all items from json array",
-        ]
+        prompts = self._prompts_json_array
 
         instructions = [
             self._mov(0, 0x1000),          # r0 = json string ptr
@@ -515,24 +733,26 @@ class ExtensionPatternGenerator:
             self._halt(),
         ]
 
-        return random.choice(prompts), instructions
+        return self._rng.choice(prompts), instructions
 
     # ========================================================================
     # HTTP CLIENT PATTERNS
     # ========================================================================
 
+    HTTP_GET_RESOURCES = ('users', 'items', 'products', 'orders', 'data', 'config')
+    HTTP_GET_PROMPTS = (
+        "make http get request to /{resource}",
+        "fetch {resource} from api",
+        "send get request and parse response",
+        "http client get /{resource} endpoint",
+        "retrieve {resource} via http get",
+    )
+
     def gen_http_get_pattern(self) -> Tuple[str, List[Instruction]]:
         """Generate HTTP GET request pattern."""
-        resources = ['users', 'items', 'products', 'orders', 'data', 'config']
-        resource = random.choice(resources)
-
-        prompts = [
-            f"make http get request to /{resource}",
-            f"fetch {resource} from api",
-            f"send get request and parse response",
-            f"http client get /{resource} endpoint",
-            f"retrieve {resource} via http get",
-        ]
+        resource = self._rng.choice(self.HTTP_GET_RESOURCES)
+
+        prompts = self._prompts_http_get[resource]
 
         instructions = [
             self._mov(0, 0x1000),          # r0 = URL ptr
@@ -549,20 +769,22 @@ class ExtensionPatternGenerator:
             self._halt(),
         ]
 
-        return random.choice(prompts), instructions
+        return self._rng.choice(prompts), instructions
+
+    HTTP_POST_RESOURCES = ('users', 'items', 'orders', 'messages', 'events')
+    HTTP_POST_PROMPTS = (
+        "make http post request to create {resource}",
+        "post json data to /{resource} endpoint",
+        "send post request with body",
+        "http client post to /{resource}",
+        "create {resource} via http post",
+    )
 
     def gen_http_post_pattern(self) -> Tuple[str, List[Instruction]]:
         """Generate HTTP POST request pattern."""
-        resources = ['users', 'items', 'orders', 'messages', 'events']
-        resource = random.choice(resources)
-
-        prompts = [
-            f"make http post request to create {resource}",
-            f"post json data to /{resource} endpoint",
-            f"send post request with body",
-            f"http client post to /{resource}",
-            f"create {resource} via http post",
-        ]
+        resource = self._rng.choice(self.HTTP_POST_RESOURCES)
+
+        prompts = self._prompts_http_post[resource]
 
         instructions = [
             self._mov(0, 0x1000),          # r0 = URL ptr
@@ -578,17 +800,19 @@ class ExtensionPatternGenerator:
             self._halt(),
         ]
 
-        return random.choice(prompts), instructions
+        return self._rng.choice(prompts), instructions
+
+    HTTP_HEADERS_PROMPTS = (
+        "make http request with authorization header",
+        "send http request with custom headers",
+        "http client with bearer token",
+        "add content-type header to http request",
+        "http request with accept header",
+    )
 
     def gen_http_with_headers_pattern(self) -> Tuple[str, List[Instruction]]:
         """Generate HTTP request with custom headers."""
-        prompts = [
-            "make http request with authorization header",
-            "send http request with custom headers",
-            "http client with bearer token",
-            "add content-type header to http request",
-            "http request with accept header",
-        ]
+        prompts = self._prompts_http_headers
 
         instructions = [
             self._mov(0, 0x1000),          # r0 = URL ptr
@@ -606,24 +830,26 @@ class ExtensionPatternGenerator:
             self._halt(),
         ]
 
-        return random.choice(prompts), instructions
+        return self._rng.choice(prompts), instructions
 
     # ========================================================================
     # DATABASE PATTERNS
     # ========================================================================
 
+    SQLITE_TABLES = ('users', 'items', 'orders', 'products', 'accounts')
+    SQLITE_QUERY_PROMPTS = (
+        "query {table} from sqlite database",
+        "execute select on {table} table",
+        "run sqlite query on {table}",
+        "fetch records from {table}",
+        "sqlite prepared statement for {table}",
+    )
+
     def gen_sqlite_query_pattern(self) -> Tuple[str, List[Instruction]]:
         """Generate SQLite query pattern."""
-        tables = ['users', 'items', 'orders', 'products', 'accounts']
-        table = random.choice(tables)
-
-        prompts = [
-            f"query {table} from sqlite database",
-            f"execute select on {table} table",
-            f"run sqlite query on {table}",
-            f"fetch records from {table}",
-            f"sqlite prepared statement for {table}",
-        ]
+        table = self._rng.choice(self.SQLITE_TABLES)
+
+        prompts = self._prompts_sqlite_query[table]
 
         instructions = [
             self._mov(0, 0x1000),          # r0 = db path ptr
@@ -639,17 +865,19 @@ class ExtensionPatternGenerator:
             self._halt(),
         ]
 
-        return random.choice(prompts), instructions
+        return self._rng.choice(prompts), instructions
+
+    SQLITE_TRANSACTION_PROMPTS = (
+        "begin sqlite transaction and commit",
+        "wrap database operations in transaction",
+        "sqlite transaction with rollback on error",
+        "atomic database update with transaction",
+        "begin commit transaction pattern",
+    )
 
     def gen_sqlite_transaction_pattern(self) -> Tuple[str, List[Instruction]]:
         """Generate SQLite transaction pattern."""
-        prompts = [
-            "begin sqlite transaction and commit",
-            "wrap database operations in transaction",
-            "sqlite transaction with rollback on error",
-            "atomic database update with transaction",
-            "begin commit transaction pattern",
-        ]
+        prompts = self._prompts_sqlite_transaction
 
         instructions = [
             self._mov(0, 0x1000),          # r0 = db path ptr
@@ -668,29 +896,32 @@ class ExtensionPatternGenerator:
             self._halt(),
         ]
 
-        return random.choice(prompts), instructions
+        return self._rng.choice(prompts), instructions
 
     # ========================================================================
     # ENCODING PATTERNS
     # ========================================================================
 
+    BASE64_ENCODE_PROMPTS = (
+        "encode binary data to base64",
+        "base64 encode input buffer",
+        "convert bytes to base64 string",
+        "apply base64 encoding",
+    )
+    BASE64_DECODE_PROMPTS = (
+        "decode base64 to binary",
+        "base64 decode string to bytes",
+        "convert base64 to raw data",
+        "apply base64 decoding",
+    )
+
     def gen_base64_roundtrip_pattern(self) -> Tuple[str, List[Instruction]]:
         """Generate base64 encode/decode pattern."""
-        if random.random() > 0.5:
-            prompts = [
-                "encode binary data to base64",
-                "base64 encode input buffer",
-                "convert bytes to base64 string",
-                "apply base64 encoding",
-            ]
+        if self._rng.random() > 0.5:
+            prompts = self._prompts_base64_encode
             ext_id = EXT_BASE64_ENCODE
         else:
-            prompts = [
-                "decode base64 to binary",
-                "base64 decode string to bytes",
-                "convert base64 to raw data",
-                "apply base64 decoding",
-            ]
+            prompts = self._prompts_base64_decode
             ext_id = EXT_BASE64_DECODE
 
         instructions = [
@@ -701,25 +932,28 @@ class ExtensionPatternGenerator:
             self._halt(),
         ]
 
-        return random.choice(prompts), instructions
+        return self._rng.choice(prompts), instructions
+
+    URL_ENCODE_PROMPTS = (
+        "url encode query parameter",
+        "percent encode string for url",
+        "encode special chars for url",
+        "apply url encoding",
+    )
+    URL_DECODE_PROMPTS = (
+        "url decode percent-encoded string",
+        "decode url query parameter",
+        "convert percent encoding to chars",
+        "apply url decoding",
+    )
 
     def gen_url_encode_pattern(self) -> Tuple[str, List[Instruction]]:
         """Generate URL encode/decode pattern."""
-        if random.random() > 0.5:
-            prompts = [
-                "url encode query parameter",
-                "percent encode string for url",
-                "encode special chars for url",
-                "apply url encoding",
-            ]
+        if self._rng.random() > 0.5:
+            prompts = self._prompts_url_encode
             ext_id = EXT_URL_ENCODE
         else:
-            prompts = [
-                "url decode percent-encoded string",
-                "decode url query parameter",
-                "convert percent encoding to chars",
-                "apply url decoding",
-            ]
+            prompts = self._prompts_url_decode
             ext_id = EXT_URL_DECODE
 
         instructions = [
@@ -730,29 +964,32 @@ class ExtensionPatternGenerator:
             self._halt(),
         ]
 
-        return random.choice(prompts), instructions
+        return self._rng.choice(prompts), instructions
 
     # ========================================================================
     # COMPRESSION PATTERNS
     # ========================================================================
 
+    GZIP_COMPRESS_PROMPTS = (
+        "gzip compress data buffer",
+        "apply gzip compression",
+        "compress response with gzip",
+        "deflate data using gzip",
+    )
+    GZIP_DECOMPRESS_PROMPTS = (
+        "gzip decompress data buffer",
+        "apply gzip decompression",
+        "inflate gzip compressed data",
+        "decompress gzip response",
+    )
+
     def gen_compression_pattern(self) -> Tuple[str, List[Instruction]]:
         """Generate gzip compression/decompression pattern."""
-        if random.random() > 0.5:
-            prompts = [
-                "gzip compress data buffer",
-                "apply gzip compression",
-                "compress response with gzip",
-                "deflate data using gzip",
-            ]
+        if self._rng.random() > 0.5:
+            prompts = self._prompts_gzip_compress
             ext_id = EXT_GZIP_COMPRESS
         else:
-            prompts = [
-                "gzip decompress data buffer",
-                "apply gzip decompression",
-                "inflate gzip compressed data",
-                "decompress gzip response",
-            ]
+            prompts = self._prompts_gzip_decompress
             ext_id = EXT_GZIP_DECOMPRESS
 
         instructions = [
@@ -764,63 +1001,127 @@ class ExtensionPatternGenerator:
             self._halt(),
         ]
 
-        return random.choice(prompts), instructions
+        return self._rng.choice(prompts), instructions
 
     # ========================================================================
     # TLS PATTERNS
     # ========================================================================
 
-    def gen_tls_secure_pattern(self) -> Tuple[str, List[Instruction]]:
-        """Generate TLS secure connection pattern."""
-        prompts = [
-            "establish tls connection to server",
-            "connect securely using tls",
-            "tls handshake and send data",
-            "create secure socket connection",
-            "https connection using tls",
-        ]
-
-        instructions = [
-            self._mov(0, 0x1000),          # r0 = hostname ptr
-            self._mov(1, 443),             # r1 = port
-            self._ext_call(EXT_TLS_CONNECT, 0, 1, 0),  # connect -> r0 = handle
-            self._mov_reg(5, 0),           # r5 = tls handle
-            self._mov(1, 0x2000),          # r1 = data to send
-            self._mov(2, 256),             # r2 = data length
-            self._ext_call(EXT_TLS_WRITE, 5, 1, 2),  # write
-            self._mov(1, 0x3000),          # r1 = receive buffer
-            self._mov(2, 4096),            # r2 = buffer size
-            self._ext_call(EXT_TLS_READ, 5, 1, 2),  # read -> r0 = bytes read
-            self._mov_reg(6, 0),           # r6 = bytes read
-            self._mov_reg(0, 5),           # r0 = handle
-            self._ext_call(EXT_TLS_CLOSE, 0, 0, 0),  # close
-            self._mov_reg(0, 6),           # return bytes read
-            self._halt(),
-        ]
+    TLS_PROMPTS = (
+        "establish tls connection to server",
+        "connect securely using tls",
+        "tls handshake and send data",
+        "create secure socket connection",
+        "https connection using tls",
+    )
 
-        return random.choice(prompts), instructions
+    def gen_tls_secure_pattern(self) -> Tuple[str, Sequence[Instruction]]:
+        """Generate TLS secure connection pattern."""
+        prompts = self._prompts_tls
+
+        return self._rng.choice(prompts), self._tls_template
+
+    TLS_PIPELINED_PROMPTS = (
+        "send multiple messages over one tls connection",
+        "reuse tls connection for several requests",
+        "send {k} messages over a secure connection",
+        "pipeline writes and reads over tls",
+        "tls connect then exchange {k} messages",
+    )
+
+    def gen_tls_pipelined_pattern(self) -> Tuple[str, Sequence[Instruction]]:
+        """Generate TLS pattern reusing one connection for several write/read pairs."""
+        k = self._rng.randint(2, 8)
+        prompts = self._prompts_tls_pipelined[k]
+
+        return self._rng.choice(prompts), self._tls_pipelined_templates[k]
+
+    def _build_tls_pipelined(self, k: int) -> Tuple[Instruction, ...]:
+        """Build the pipelined TLS instruction sequence for k write/read pairs."""
+        # Bind hot lookups to locals for the per-pair loop
+        mov, mov_reg, ext_call = self._mov, self._mov_reg, self._ext_call
+        tls_write, tls_read = EXT_TLS_WRITE, EXT_TLS_READ
+
+        # Fixed length: 4 setup + 6 per write/read pair + 5 teardown
+        instructions = [None] * (9 + 6 * k)
+        instructions[0] = mov(0, 0x1000)              # r0 = hostname ptr
+        instructions[1] = mov(1, 443)                 # r1 = port
+        instructions[2] = ext_call(EXT_TLS_CONNECT, 0, 1, 0)  # connect -> r0 = handle
+        instructions[3] = mov_reg(5, 0)               # r5 = tls handle
+        pos = 4
+        for i in range(k):
+            instructions[pos] = mov(1, 0x2000 + i * 256)      # r1 = message i
+            instructions[pos + 1] = mov(2, 256)               # r2 = message length
+            instructions[pos + 2] = ext_call(tls_write, 5, 1, 2)  # write
+            instructions[pos + 3] = mov(1, 0x3000 + i * 4096)  # r1 = response buffer i
+            instructions[pos + 4] = mov(2, 4096)              # r2 = buffer size
+            instructions[pos + 5] = ext_call(tls_read, 5, 1, 2)  # read -> r0 = bytes read
+            pos += 6
+        instructions[pos] = mov_reg(6, 0)             # r6 = bytes read (last response)
+        instructions[pos + 1] = mov_reg(0, 5)         # r0 = handle
+        instructions[pos + 2] = ext_call(EXT_TLS_CLOSE, 0, 0, 0)  # close
+        instructions[pos + 3] = mov_reg(0, 6)         # return bytes read
+        instructions[pos + 4] = self._halt()
+
+        return tuple(instructions)
 
     # ========================================================================
     # UUID PATTERNS
     # ========================================================================
 
-    def gen_uuid_pattern(self) -> Tuple[str, List[Instruction]]:
-        """Generate UUID generation pattern."""
-        prompts = [
-            "generate uuid v4",
-            "create random uuid",
-            "generate unique identifier",
-            "create uuid for new record",
-            "generate random uuid v4 string",
-        ]
-
-        instructions = [
-            self._mov(0, 0x1000),          # r0 = output buffer (36 bytes)
-            self._ext_call(EXT_UUID_V4, 0, 0, 0),  # generate uuid
-            self._halt(),
-        ]
+    UUID_PROMPTS = (
+        "generate uuid v4",
+        "create random uuid",
+        "generate unique identifier",
+        "create uuid for new record",
+        "generate random uuid v4 string",
+    )
 
-        return random.choice(prompts), instructions
+    def gen_uuid_pattern(self) -> Tuple[str, Sequence[Instruction]]:
+        """Generate UUID generation pattern."""
+        prompts = self._prompts_uuid
+
+        return self._rng.choice(prompts), self._uuid_template
+
+
+def write_packed(f, batch: Dict, slots: int = 64) -> int:
+    """Write a generate_packed_batch() result as length-prefixed binary records.
+
+    Each record is a u16 prompt length, the UTF-8 prompt, a u8 instruction
+    count and that many packed instructions. The whole batch is assembled in
+    memory and written with a single call. Returns the number of bytes written.
+    """
+    instructions = memoryview(batch['instructions'])
+    stride = slots * INSTR_SIZE
+    out = bytearray()
+    for i, (prompt, n) in enumerate(zip(batch['context'], batch['n_instr'])):
+        prompt_bytes = prompt.encode('utf-8')
+        start = i * stride
+        out += PROMPT_LEN_STRUCT.pack(len(prompt_bytes))
+        out += prompt_bytes
+        out += N_INSTR_STRUCT.pack(n)
+        out += instructions[start:start + n * INSTR_SIZE]
+    return f.write(out)
+
+
+def read_packed(data: bytes):
+    """Iterate (prompt, packed instructions) records written by write_packed."""
+    view = memoryview(data)
+    pos = 0
+    while pos < len(view):
+        (prompt_len,) = PROMPT_LEN_STRUCT.unpack_from(view, pos)
+        pos += PROMPT_LEN_STRUCT.size
+        prompt = str(view[pos:pos + prompt_len], 'utf-8')
+        pos += prompt_len
+        (n,) = N_INSTR_STRUCT.unpack_from(view, pos)
+        pos += N_INSTR_STRUCT.size
+        yield prompt, bytes(view[pos:pos + n * INSTR_SIZE])
+        pos += n * INSTR_SIZE
+
+
+def _generate_chunk(count: int, seed: int) -> List[Dict]:
+    """Worker entry point for generate_samples_parallel."""
+    return ExtensionPatternGenerator(seed=seed).generate_samples(count)
 
 
 def main():
@@ -835,9 +1136,8 @@ def main():
     for s in samples[:10]:
         print(f"  - {s['context']}")
 
-    # Count valid instructions
-    valid_counts = [sum(1 for i in s['instructions'] if i['valid']) for s in samples]
-    avg_valid = sum(valid_counts) / len(valid_counts)
+    # Generated instructions are always valid, so counts are recorded at generation time
+    avg_valid = sum(s['valid_count'] for s in samples) / len(samples)
     print(f"\nAverage valid instructions: {avg_valid:.1f}")
 
 
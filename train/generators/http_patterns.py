@@ -12,15 +12,32 @@ Generates training samples for HTTP protocol patterns:
 - HTTP method routing
 - Query string parsing
 - Cookie handling
+
+Columnar Output:
+  generate_samples_columnar() packs each of the 64 slots into a SLOT_SIZE-byte
+  little-endian record: valid, opcode, mode, rd, rs1, rs2, has_imm (u8 each)
+  followed by imm_bin (i32) -- the same fields as the JSONL slot dicts. The
+  matching numpy dtype is SLOT_DTYPE:
+  [('valid','u1'), ('opcode','u1'), ('mode','u1'), ('rd','u1'),
+   ('rs1','u1'), ('rs2','u1'), ('has_imm','u1'), ('imm_bin','<i4')].
+
+  generate_samples_to_npz() writes the same batch as a compressed .npz with
+  an 'instructions' (count, 64) SLOT_DTYPE array and a 'context' unicode
+  array, loadable with np.load() and no pickle.
 """
 
+import functools
+import itertools
+import os
 import random
-from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass
+import struct
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Dict, Tuple, Optional, NamedTuple, Sequence
 
 
-@dataclass
-class Instruction:
+class Instruction(NamedTuple):
     """Instruction representation for training data."""
     opcode: int
     mode: int
@@ -30,17 +47,154 @@ class Instruction:
     has_imm: int
     imm: int
 
-    def to_dict(self) -> Dict[str, int]:
-        return {
+
+# Slot dict for an empty (padding) slot, shared by every padded sample
+_PAD_SLOT = {
+    'valid': 0, 'opcode': 0, 'mode': 0, 'rd': 0,
+    'rs1': 0, 'rs2': 0, 'has_imm': 0, 'imm_bin': 0
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _padded_slots(instructions: Tuple[Instruction, ...], slots: int = 64) -> List[Dict]:
+    """Build the padded JSONL slot dicts for a fixed instruction body.
+
+    Pattern bodies are module constants, so each one is converted once per
+    process and the resulting list is shared by every sample that uses it.
+    """
+    result = [
+        {
             'valid': 1,
-            'opcode': self.opcode,
-            'mode': self.mode,
-            'rd': self.rd,
-            'rs1': self.rs1,
-            'rs2': self.rs2,
-            'has_imm': self.has_imm,
-            'imm_bin': self.imm if self.has_imm else 0,
+            'opcode': opcode,
+            'mode': mode,
+            'rd': rd,
+            'rs1': rs1,
+            'rs2': rs2,
+            'has_imm': has_imm,
+            'imm_bin': imm if has_imm else 0,
         }
+        for opcode, mode, rd, rs1, rs2, has_imm, imm in instructions[:slots]
+    ]
+    result.extend([_PAD_SLOT] * (slots - len(result)))
+    return result
+
+
+# Packed slot record for columnar output (see module docstring)
+SLOT_STRUCT = struct.Struct('<7Bi')
+SLOT_SIZE = SLOT_STRUCT.size
+SLOT_DTYPE = [
+    ('valid', 'u1'), ('opcode', 'u1'), ('mode', 'u1'), ('rd', 'u1'),
+    ('rs1', 'u1'), ('rs2', 'u1'), ('has_imm', 'u1'), ('imm_bin', '<i4'),
+]
+
+
+@functools.lru_cache(maxsize=None)
+def _packed_slots(instructions: Tuple[Instruction, ...], slots: int = 64) -> bytes:
+    """Pack a fixed instruction body into one zero-padded row of slot records.
+
+    Like _padded_slots, each body is packed once per process; records are
+    written in place into a single zeroed buffer, so padding needs no work.
+    """
+    row = bytearray(slots * SLOT_SIZE)
+    offsets = range(0, len(row), SLOT_SIZE)
+    for offset, (opcode, mode, rd, rs1, rs2, has_imm, imm) in zip(offsets, instructions):
+        SLOT_STRUCT.pack_into(row, offset, 1, opcode, mode, rd, rs1, rs2,
+                              has_imm, imm if has_imm else 0)
+    return bytes(row)
+
+# Opcodes
+OP_MOV = 0x1C
+OP_LOAD = 0x03
+OP_STORE = 0x04
+OP_BRANCH = 0x06
+OP_ALU = 0x00
+OP_ALUI = 0x01
+OP_CALL = 0x07
+OP_RET = 0x08
+OP_HALT = 0x1D
+OP_NET = 0x15
+OP_IO = 0x17
+
+# ALU modes
+ALU_ADD = 0
+ALU_SUB = 1
+ALU_AND = 2
+ALU_OR = 3
+ALU_XOR = 4
+
+# Branch modes
+BR_EQ = 0
+BR_NE = 1
+BR_LT = 2
+BR_GE = 3
+
+# Net modes
+NET_SEND = 5
+NET_RECV = 4
+
+
+# Memory layout shared by the patterns: the message being parsed or built
+# sits at BUF_MESSAGE, string constants and scratch buffers in the pages
+# after it
+BUF_MESSAGE = 0x1000
+BUF_DATA_1 = 0x2000
+BUF_DATA_2 = 0x3000
+BUF_DATA_3 = 0x4000
+BUF_DATA_4 = 0x5000
+BUF_DATA_5 = 0x6000
+
+
+# Instruction builders; argument-free instructions are shared singletons
+def _mov(rd: int, imm: int) -> Instruction:
+    return Instruction(OP_MOV, 0, rd, 0, 0, 1, imm)
+
+
+def _mov_reg(rd: int, rs: int) -> Instruction:
+    return Instruction(OP_MOV, 0, rd, rs, 0, 0, 0)
+
+
+def _load_byte(rd: int, rs: int, offset: int = 0) -> Instruction:
+    return Instruction(OP_LOAD, 0, rd, rs, 0, 1, offset)
+
+
+def _load_word(rd: int, rs: int, offset: int = 0) -> Instruction:
+    return Instruction(OP_LOAD, 3, rd, rs, 0, 1, offset)
+
+
+def _store_byte(rs: int, rd: int, offset: int = 0) -> Instruction:
+    return Instruction(OP_STORE, 0, rd, rs, 0, 1, offset)
+
+
+def _store_word(rs: int, rd: int, offset: int = 0) -> Instruction:
+    return Instruction(OP_STORE, 3, rd, rs, 0, 1, offset)
+
+
+def _branch(mode: int, rs1: int, rs2: int, offset: int) -> Instruction:
+    return Instruction(OP_BRANCH, mode, 0, rs1, rs2, 1, offset)
+
+
+def _alu(mode: int, rd: int, rs1: int, rs2: int) -> Instruction:
+    return Instruction(OP_ALU, mode, rd, rs1, rs2, 0, 0)
+
+
+def _alui(mode: int, rd: int, rs: int, imm: int) -> Instruction:
+    return Instruction(OP_ALUI, mode, rd, rs, 0, 1, imm)
+
+
+def _call(offset: int) -> Instruction:
+    return Instruction(OP_CALL, 0, 0, 0, 0, 1, offset)
+
+
+def _net_send(rd: int, fd: int, buf: int, flags: int = 0) -> Instruction:
+    return Instruction(OP_NET, NET_SEND, rd, fd, buf, 1, flags)
+
+
+def _net_recv(rd: int, fd: int, buf: int, flags: int = 0) -> Instruction:
+    return Instruction(OP_NET, NET_RECV, rd, fd, buf, 1, flags)
+
+
+RET = Instruction(OP_RET, 0, 0, 0, 0, 0, 0)
+HALT = Instruction(OP_HALT, 0, 0, 0, 0, 0, 0)
 
 
 # HTTP Status codes
@@ -62,72 +216,739 @@ STATUS_CODES = {
 
 # Common HTTP headers
 HEADERS = {
-    'request': [
-        ('Content-Type', ['application/json', 'application/x-www-form-urlencoded', 'text/plain', 'multipart/form-data']),
-        ('Accept', ['application/json', '*/*', 'text/html', 'application/xml']),
-        ('Authorization', ['Bearer token123', 'Basic base64creds', 'API-Key key123']),
-        ('Content-Length', ['0', '128', '256', '1024', '4096']),
-        ('User-Agent', ['Mozilla/5.0', 'curl/7.68.0', 'PostmanRuntime/7.28.0']),
-        ('Host', ['api.example.com', 'localhost:8080', 'service.internal']),
-        ('Accept-Encoding', ['gzip, deflate', 'gzip', 'br']),
-        ('Cookie', ['session=abc123', 'token=xyz789', 'user_id=42']),
-        ('X-Request-ID', ['req-123', 'trace-abc-def', 'uuid-here']),
-        ('If-None-Match', ['"etag123"', '"version-1"', 'W/"weak-etag"']),
-        ('If-Match', ['"etag123"', '"version-1"']),
-    ],
-    'response': [
-        ('Content-Type', ['application/json; charset=utf-8', 'text/html', 'text/plain']),
-        ('Content-Length', ['0', '64', '256', '1024']),
-        ('Cache-Control', ['no-cache', 'max-age=3600', 'public, max-age=86400']),
-        ('ETag', ['"abc123"', '"v1"', 'W/"weak"']),
-        ('X-Request-ID', ['req-123', 'trace-abc']),
-        ('Set-Cookie', ['session=xyz; HttpOnly', 'token=abc; Secure']),
-        ('Location', ['/users/123', '/api/items/new-id']),
-        ('WWW-Authenticate', ['Bearer realm="api"', 'Basic realm="secure"']),
-        ('Retry-After', ['30', '60', '120']),
-        ('X-RateLimit-Remaining', ['99', '50', '0']),
-    ],
+    'request': (
+        ('Content-Type', ('application/json', 'application/x-www-form-urlencoded', 'text/plain', 'multipart/form-data')),
+        ('Accept', ('application/json', '*/*', 'text/html', 'application/xml')),
+        ('Authorization', ('Bearer token123', 'Basic base64creds', 'API-Key key123')),
+        ('Content-Length', ('0', '128', '256', '1024', '4096')),
+        ('User-Agent', ('Mozilla/5.0', 'curl/7.68.0', 'PostmanRuntime/7.28.0')),
+        ('Host', ('api.example.com', 'localhost:8080', 'service.internal')),
+        ('Accept-Encoding', ('gzip, deflate', 'gzip', 'br')),
+        ('Cookie', ('session=abc123', 'token=xyz789', 'user_id=42')),
+        ('X-Request-ID', ('req-123', 'trace-abc-def', 'uuid-here')),
+        ('If-None-Match', ('"etag123"', '"version-1"', 'W/"weak-etag"')),
+        ('If-Match', ('"etag123"', '"version-1"')),
+    ),
+    'response': (
+        ('Content-Type', ('application/json; charset=utf-8', 'text/html', 'text/plain')),
+        ('Content-Length', ('0', '64', '256', '1024')),
+        ('Cache-Control', ('no-cache', 'max-age=3600', 'public, max-age=86400')),
+        ('ETag', ('"abc123"', '"v1"', 'W/"weak"')),
+        ('X-Request-ID', ('req-123', 'trace-abc')),
+        ('Set-Cookie', ('session=xyz; HttpOnly', 'token=abc; Secure')),
+        ('Location', ('/users/123', '/api/items/new-id')),
+        ('WWW-Authenticate', ('Bearer realm="api"', 'Basic realm="secure"')),
+        ('Retry-After', ('30', '60', '120')),
+        ('X-RateLimit-Remaining', ('99', '50', '0')),
+    ),
 }
 
 # HTTP Methods
-HTTP_METHODS = ['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS']
+HTTP_METHODS = ('GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS')
+
+
+# Pattern prompts. Templates are expanded over each pattern's variants by
+# _expand_prompts; every variant has the same number of templates, so a
+# uniform draw from the expanded table matches picking a variant and then
+# a template.
+
+
+def _expand_prompts(templates: Sequence[str], variants: Optional[Sequence[Dict]] = None) -> Tuple[str, ...]:
+    """Format prompt templates for every variant's field dict into one flat,
+    interned table."""
+    if variants is None:
+        return tuple(sys.intern(t) for t in templates)
+    return tuple(sys.intern(t.format_map(fields)) for fields in variants for t in templates)
+
+
+_CONTENT_TYPES = (
+    ('application/json', 'json'),
+    ('application/x-www-form-urlencoded', 'form'),
+    ('text/plain', 'text'),
+    ('multipart/form-data', 'multipart'),
+)
+_PARSE_CONTENT_TYPE_PROMPTS = (
+    "parse content-type header from request",
+    "check if content-type is {ct}",
+    "detect {short} content type",
+    "extract content-type from http headers",
+    "validate request content type",
+)
+_CONTENT_TYPE_FIELDS = tuple(
+    {'ct': ct, 'short': short}
+    for ct, short in _CONTENT_TYPES
+)
+_PARSE_CONTENT_TYPE_TABLE = _expand_prompts(_PARSE_CONTENT_TYPE_PROMPTS, _CONTENT_TYPE_FIELDS)
+
+_AUTH_TYPES = ('Bearer', 'Basic', 'API-Key')
+_PARSE_AUTHORIZATION_PROMPTS = (
+    "parse authorization header from request",
+    "extract {auth_type} token from authorization",
+    "get bearer token from authorization header",
+    "validate authorization header format",
+    "extract api key from authorization",
+)
+_AUTH_TYPE_FIELDS = tuple(
+    {'auth_type': auth_type}
+    for auth_type in _AUTH_TYPES
+)
+_PARSE_AUTHORIZATION_TABLE = _expand_prompts(_PARSE_AUTHORIZATION_PROMPTS, _AUTH_TYPE_FIELDS)
+
+_PARSE_CONTENT_LENGTH_PROMPTS = (
+    "parse content-length header",
+    "extract content length value",
+    "get request body size from content-length",
+    "read content-length as integer",
+    "parse http content length header",
+)
+_PARSE_CONTENT_LENGTH_TABLE = _expand_prompts(_PARSE_CONTENT_LENGTH_PROMPTS)
+
+_PARSE_ACCEPT_HEADER_PROMPTS = (
+    "parse accept header from request",
+    "check if client accepts json",
+    "extract accepted content types",
+    "validate accept header",
+    "determine response content type from accept",
+)
+_PARSE_ACCEPT_HEADER_TABLE = _expand_prompts(_PARSE_ACCEPT_HEADER_PROMPTS)
+
+_COOKIE_NAMES = ('session', 'token', 'user_id', 'auth')
+_PARSE_COOKIE_HEADER_PROMPTS = (
+    "extract {cookie} cookie from request",
+    "parse cookie header values",
+    "get {cookie} value from cookies",
+    "read session cookie from request",
+    "parse http cookie header",
+)
+_COOKIE_FIELDS = tuple(
+    {'cookie': cookie}
+    for cookie in _COOKIE_NAMES
+)
+_PARSE_COOKIE_HEADER_TABLE = _expand_prompts(_PARSE_COOKIE_HEADER_PROMPTS, _COOKIE_FIELDS)
+
+_PARSE_IF_MATCH_PROMPTS = (
+    "parse if-match header for conditional update",
+    "extract etag from if-match header",
+    "check if-match precondition",
+    "validate etag for update request",
+)
+_PARSE_IF_NONE_MATCH_PROMPTS = (
+    "parse if-none-match header for caching",
+    "extract etag from if-none-match",
+    "check cache validation header",
+    "validate if-none-match condition",
+)
+_PARSE_IF_MATCH_TABLE = (
+    _expand_prompts(_PARSE_IF_MATCH_PROMPTS) + _expand_prompts(_PARSE_IF_NONE_MATCH_PROMPTS)
+)
+
+_SUCCESS_CODES = ((200, 'OK'), (201, 'Created'), (204, 'No Content'))
+_SEND_SUCCESS_RESPONSE_PROMPTS = (
+    "send http {code} {text} response",
+    "return {code} success response",
+    "build and send {code} response",
+    "respond with http {code}",
+    "send {text_lower} status code",
+)
+_SUCCESS_CODE_FIELDS = tuple(
+    {'code': code, 'text': text, 'text_lower': text.lower()}
+    for code, text in _SUCCESS_CODES
+)
+_SEND_SUCCESS_RESPONSE_TABLE = _expand_prompts(_SEND_SUCCESS_RESPONSE_PROMPTS, _SUCCESS_CODE_FIELDS)
+
+_ERROR_CODES = (
+    (400, 'Bad Request'),
+    (401, 'Unauthorized'),
+    (403, 'Forbidden'),
+    (404, 'Not Found'),
+    (500, 'Internal Server Error'),
+)
+_SEND_ERROR_RESPONSE_PROMPTS = (
+    "send http {code} {text} error response",
+    "return {code} error",
+    "respond with {code} status",
+    "build {text_lower} error response",
+    "send {code} with error body",
+)
+_ERROR_CODE_FIELDS = tuple(
+    {'code': code, 'text': text, 'text_lower': text.lower()}
+    for code, text in _ERROR_CODES
+)
+_SEND_ERROR_RESPONSE_TABLE = _expand_prompts(_SEND_ERROR_RESPONSE_PROMPTS, _ERROR_CODE_FIELDS)
+
+_CHECK_STATUS_CODE_PROMPTS = (
+    "check if http status indicates success",
+    "validate response status code",
+    "check for 2xx success status",
+    "determine if request succeeded from status",
+    "check http response status",
+)
+_CHECK_STATUS_CODE_TABLE = _expand_prompts(_CHECK_STATUS_CODE_PROMPTS)
+
+_PARSE_HTTP_METHOD_PROMPTS = (
+    "parse http method from request line",
+    "extract request method GET POST PUT DELETE",
+    "identify http method from request",
+    "check http request method",
+    "determine http method from first line",
+)
+_PARSE_HTTP_METHOD_TABLE = _expand_prompts(_PARSE_HTTP_METHOD_PROMPTS)
+
+_PARSE_REQUEST_PATH_PROMPTS = (
+    "extract url path from http request",
+    "parse request path from request line",
+    "get path component from http request",
+    "extract uri path from request",
+    "parse path between method and http version",
+)
+_PARSE_REQUEST_PATH_TABLE = _expand_prompts(_PARSE_REQUEST_PATH_PROMPTS)
+
+_QUERY_PARAMS = ('id', 'page', 'limit', 'offset', 'search', 'filter')
+_PARSE_QUERY_STRING_PROMPTS = (
+    "parse query string parameter {param}",
+    "extract query parameters from url",
+    "get {param} value from query string",
+    "parse url query string",
+    "decode query parameters from request",
+)
+_QUERY_PARAM_FIELDS = tuple(
+    {'param': param}
+    for param in _QUERY_PARAMS
+)
+_PARSE_QUERY_STRING_TABLE = _expand_prompts(_PARSE_QUERY_STRING_PROMPTS, _QUERY_PARAM_FIELDS)
+
+_PARSE_REQUEST_BODY_PROMPTS = (
+    "extract body from http request",
+    "find request body after headers",
+    "parse http request body",
+    "get post body from request",
+    "extract payload from http request",
+)
+_PARSE_REQUEST_BODY_TABLE = _expand_prompts(_PARSE_REQUEST_BODY_PROMPTS)
+
+_BUILD_JSON_RESPONSE_PROMPTS = (
+    "build json http response",
+    "create json response with headers",
+    "format json response body",
+    "construct http json response",
+    "build rest api json response",
+)
+_BUILD_JSON_RESPONSE_TABLE = _expand_prompts(_BUILD_JSON_RESPONSE_PROMPTS)
+
+_RESPONSE_HEADERS = (
+    ('Cache-Control', 'no-cache'),
+    ('ETag', '"abc123"'),
+    ('X-Request-ID', 'req-123'),
+)
+_BUILD_RESPONSE_HEADERS_PROMPTS = (
+    "add {header} header to response",
+    "build http response headers",
+    "set {header} response header",
+    "construct response header section",
+    "append header to http response",
+)
+_RESPONSE_HEADER_FIELDS = tuple(
+    {'header': header}
+    for header, _ in _RESPONSE_HEADERS
+)
+_BUILD_RESPONSE_HEADERS_TABLE = _expand_prompts(_BUILD_RESPONSE_HEADERS_PROMPTS, _RESPONSE_HEADER_FIELDS)
+
+_REDIRECT_CODES = ((301, 'Moved Permanently'), (302, 'Found'), (307, 'Temporary Redirect'))
+_SEND_REDIRECT_PROMPTS = (
+    "send http {code} redirect response",
+    "redirect client with {code} status",
+    "send redirect with location header",
+    "return {text_lower} redirect",
+    "build redirect response with location",
+)
+_REDIRECT_CODE_FIELDS = tuple(
+    {'code': code, 'text_lower': text.lower()}
+    for code, text in _REDIRECT_CODES
+)
+_SEND_REDIRECT_TABLE = _expand_prompts(_SEND_REDIRECT_PROMPTS, _REDIRECT_CODE_FIELDS)
+
+_METHOD_ROUTER_PROMPTS = (
+    "route request by http method",
+    "dispatch handler based on method",
+    "create method router for http requests",
+    "switch on http method type",
+    "route to handler by request method",
+)
+_METHOD_ROUTER_TABLE = _expand_prompts(_METHOD_ROUTER_PROMPTS)
+
+_CORS_PREFLIGHT_PROMPTS = (
+    "handle cors preflight options request",
+    "respond to cors preflight with headers",
+    "build cors preflight response",
+    "handle options request for cors",
+    "send access-control-allow headers",
+)
+_CORS_PREFLIGHT_TABLE = _expand_prompts(_CORS_PREFLIGHT_PROMPTS)
+
+
+# Pattern instruction bodies. They are fixed per pattern (only prompts vary),
+# so they are built once at import and shared between samples.
+
+# Subroutines shared by the header parsers, spliced into each template after
+# its main body. Branch offsets are relative so the blocks are position
+# independent; the caller's _call() offset must point at the block's start.
+
+# find_header: scan for header name
+_FIND_HEADER_BLOCK = (
+    _load_byte(2, 0, 0),       # load char
+    _branch(BR_EQ, 2, 0, 3),  # if null, not found
+    _alui(ALU_ADD, 0, 0, 1),  # advance ptr
+    _branch(0, 0, 0, -3),      # loop
+    _mov(0, 0),                # not found
+    RET,
+)
+
+# find_header stub: returns a mock found position in the header buffer
+_FIND_HEADER_STUB = (
+    _mov(0, BUF_MESSAGE + 0x100),
+    RET,
+)
+
+# strcmp: r0 = 1 if the strings at r0 and r1 are equal, else 0
+_STRCMP_BLOCK = (
+    _load_byte(2, 0, 0),
+    _load_byte(3, 1, 0),
+    _branch(BR_NE, 2, 3, 4),  # if different, return 0
+    _branch(BR_EQ, 2, 0, 3),  # if both null, return 1
+    _alui(ALU_ADD, 0, 0, 1),
+    _alui(ALU_ADD, 1, 1, 1),
+    _branch(0, 0, 0, -6),
+    _mov(0, 1),
+    RET,
+    _mov(0, 0),
+    RET,
+)
+
+# Pattern: search for "Content-Type:" then compare value
+_PARSE_CONTENT_TYPE_TEMPLATE = (
+    _mov(0, BUF_MESSAGE),      # r0 = header buffer ptr
+    _mov(1, BUF_DATA_1),       # r1 = "Content-Type:" pattern
+    _call(10),                  # call find_header
+    _branch(BR_EQ, 0, 0, 7),  # if not found, return 0
+    _mov(1, BUF_DATA_2),       # r1 = expected content type
+    _call(15),                  # call strcmp
+    _mov_reg(5, 0),            # r5 = result
+    RET,
+    *_FIND_HEADER_BLOCK,
+    *_STRCMP_BLOCK,
+)
+
+_PARSE_AUTHORIZATION_TEMPLATE = (
+    _mov(0, BUF_MESSAGE),      # r0 = header buffer
+    _mov(1, BUF_DATA_1),       # r1 = "Authorization:" pattern
+    _call(8),                   # find_header
+    _branch(BR_EQ, 0, 0, 5),  # if not found, error
+    # Skip "Bearer " prefix (7 chars)
+    _alui(ALU_ADD, 0, 0, 7),
+    # Copy token to output
+    _mov(1, BUF_DATA_2),       # r1 = output buffer
+    _call(12),                  # copy_until_space
+    RET,
+    # error:
+    _mov(0, 0),
+    RET,
+    *_FIND_HEADER_STUB,
+    # copy_until_space
+    _load_byte(2, 0, 0),
+    _mov(3, 0x20),             # space
+    _branch(BR_EQ, 2, 3, 4),
+    _branch(BR_EQ, 2, 0, 3),  # null terminator
+    _store_byte(2, 1, 0),
+    _alui(ALU_ADD, 0, 0, 1),
+    _alui(ALU_ADD, 1, 1, 1),
+    _branch(0, 0, 0, -6),
+    _store_byte(0, 1, 0),      # null terminate
+    RET,
+)
+
+_PARSE_CONTENT_LENGTH_TEMPLATE = (
+    _mov(0, BUF_MESSAGE),      # r0 = headers buffer
+    _mov(1, BUF_DATA_1),       # r1 = "Content-Length:" pattern
+    _call(8),                   # find_header
+    _branch(BR_EQ, 0, 0, 5),  # if not found, return 0
+    # Parse digits to integer
+    _call(12),                  # atoi
+    RET,
+    # error:
+    _mov(0, 0),
+    RET,
+    *_FIND_HEADER_STUB,
+    # atoi: parse decimal string to int
+    _mov(1, 0),                # result = 0
+    _load_byte(2, 0, 0),       # load char
+    _mov(3, 0x30),             # '0'
+    _alu(ALU_SUB, 4, 2, 3),  # digit = char - '0'
+    _mov(5, 10),
+    _branch(BR_GE, 4, 5, 4),  # if >= 10, done
+    _branch(BR_LT, 4, 0, 3),  # if < 0, done (using zero reg)
+    # result = result * 10 + digit
+    _mov(5, 10),
+    # (multiply by 10 using shifts and adds: x*10 = x*8 + x*2)
+    _alui(ALU_ADD, 1, 1, 0),  # simplified: just accumulate
+    _alui(ALU_ADD, 0, 0, 1),
+    _branch(0, 0, 0, -9),
+    _mov_reg(0, 1),
+    RET,
+)
+
+_PARSE_ACCEPT_HEADER_TEMPLATE = (
+    _mov(0, BUF_MESSAGE),      # r0 = headers
+    _mov(1, BUF_DATA_1),       # r1 = "Accept:" pattern
+    _call(6),                   # find_header
+    _branch(BR_EQ, 0, 0, 3),  # if not found, use default
+    _mov(1, BUF_DATA_2),       # r1 = "application/json"
+    _call(10),                  # str_contains
+    RET,
+    # default:
+    _mov(0, 1),                # assume json accepted
+    RET,
+    *_FIND_HEADER_STUB,
+    # str_contains stub
+    _mov(0, 1),
+    RET,
+)
+
+_PARSE_COOKIE_HEADER_TEMPLATE = (
+    _mov(0, BUF_MESSAGE),      # r0 = headers
+    _mov(1, BUF_DATA_1),       # r1 = "Cookie:" pattern
+    _call(8),                   # find_header
+    _branch(BR_EQ, 0, 0, 5),
+    # Find specific cookie name
+    _mov(1, BUF_DATA_2),       # r1 = cookie name
+    _call(12),                  # find_cookie_value
+    RET,
+    # not found:
+    _mov(0, 0),
+    RET,
+    *_FIND_HEADER_STUB,
+    # find_cookie_value stub
+    _mov(0, BUF_DATA_3),       # return value ptr
+    RET,
+)
+
+_PARSE_IF_MATCH_TEMPLATE = (
+    _mov(0, BUF_MESSAGE),      # r0 = headers
+    _mov(1, BUF_DATA_1),       # r1 = header pattern
+    _call(6),                   # find_header
+    _branch(BR_EQ, 0, 0, 3),
+    _call(10),                  # parse_etag
+    RET,
+    # not found:
+    _mov(0, 0),
+    RET,
+    *_FIND_HEADER_STUB,
+    # parse_etag stub
+    _mov(0, BUF_DATA_2),
+    RET,
+)
+
+_SEND_SUCCESS_RESPONSE_TEMPLATE = (
+    _mov(0, BUF_MESSAGE),      # r0 = response buffer
+    # Build "HTTP/1.1 {code} {text}\r\n"
+    _mov(1, BUF_DATA_1),       # r1 = status line template
+    _call(10),                  # strcpy
+    # Add headers
+    _mov(1, BUF_DATA_2),       # r1 = "Content-Type: application/json\r\n"
+    _call(10),                  # strcat
+    _mov(1, BUF_DATA_3),       # r1 = "Content-Length: "
+    _call(10),
+    # Add body length
+    _mov(1, 0),                # content length
+    _call(14),                  # itoa
+    # CRLF CRLF
+    _mov(1, BUF_DATA_4),       # r1 = "\r\n\r\n"
+    _call(10),
+    # Send
+    _mov(1, 11),               # r1 = socket fd (r11)
+    _mov_reg(2, 0),            # r2 = response buffer
+    _net_send(0, 1, 2),
+    RET,
+    # strcpy stub
+    RET,
+    # itoa stub
+    RET,
+)
+
+_SEND_ERROR_RESPONSE_TEMPLATE = (
+    _mov(0, BUF_MESSAGE),      # r0 = response buffer
+    # Build status line
+    _mov(1, BUF_DATA_1),       # r1 = "HTTP/1.1 {code} {text}\r\n"
+    _call(12),                  # strcpy
+    # Headers
+    _mov(1, BUF_DATA_2),       # r1 = headers
+    _call(12),                  # strcat
+    # Error body JSON
+    _mov(1, BUF_DATA_3),       # r1 = '{"error":"..."}'
+    _call(12),
+    # Send response
+    _mov(1, 11),               # socket fd
+    _mov_reg(2, 0),
+    _mov(3, 256),              # length estimate
+    _net_send(0, 1, 2),
+    RET,
+    # strcpy stub
+    RET,
+)
+
+_CHECK_STATUS_CODE_TEMPLATE = (
+    _mov(1, 200),              # r1 = 200
+    _branch(BR_LT, 0, 1, 6),  # if < 200, error
+    _mov(1, 300),              # r1 = 300
+    _branch(BR_GE, 0, 1, 4),  # if >= 300, error
+    # Success (2xx)
+    _mov(0, 1),
+    RET,
+    # Error
+    _mov(0, 0),
+    RET,
+)
+
+_PARSE_HTTP_METHOD_TEMPLATE = (
+    _mov(0, BUF_MESSAGE),      # r0 = request buffer
+    _load_byte(1, 0, 0),       # first char
+    # Check 'G' for GET
+    _mov(2, 0x47),             # 'G'
+    _branch(BR_EQ, 1, 2, 8),  # goto is_get
+    # Check 'P' for POST/PUT/PATCH
+    _mov(2, 0x50),             # 'P'
+    _branch(BR_EQ, 1, 2, 8),  # goto is_p_method
+    # Check 'D' for DELETE
+    _mov(2, 0x44),             # 'D'
+    _branch(BR_EQ, 1, 2, 8),  # goto is_delete
+    # Check 'H' for HEAD
+    _mov(2, 0x48),             # 'H'
+    _branch(BR_EQ, 1, 2, 8),  # goto is_head
+    # Unknown method
+    _mov(0, 0),
+    RET,
+    # is_get:
+    _mov(0, 1),                # GET = 1
+    RET,
+    # is_p_method: check second char for POST vs PUT vs PATCH
+    _load_byte(1, 0, 1),
+    _mov(2, 0x4F),             # 'O' for POST
+    _branch(BR_EQ, 1, 2, 3),
+    _mov(0, 3),                # PUT = 3
+    RET,
+    _mov(0, 2),                # POST = 2
+    RET,
+    # is_delete:
+    _mov(0, 4),                # DELETE = 4
+    RET,
+    # is_head:
+    _mov(0, 5),                # HEAD = 5
+    RET,
+)
+
+_PARSE_REQUEST_PATH_TEMPLATE = (
+    _mov(0, BUF_MESSAGE),      # r0 = request buffer
+    _mov(1, BUF_DATA_1),       # r1 = path output buffer
+    # Skip method (find first space)
+    _load_byte(2, 0, 0),
+    _mov(3, 0x20),             # space
+    _branch(BR_EQ, 2, 3, 2),
+    _alui(ALU_ADD, 0, 0, 1),
+    _branch(0, 0, 0, -4),
+    # Skip the space
+    _alui(ALU_ADD, 0, 0, 1),
+    # Copy path until next space or ?
+    _load_byte(2, 0, 0),
+    _mov(3, 0x20),             # space
+    _branch(BR_EQ, 2, 3, 6),
+    _mov(3, 0x3F),             # '?'
+    _branch(BR_EQ, 2, 3, 4),
+    _store_byte(2, 1, 0),
+    _alui(ALU_ADD, 0, 0, 1),
+    _alui(ALU_ADD, 1, 1, 1),
+    _branch(0, 0, 0, -8),
+    # Null terminate
+    _store_byte(0, 1, 0),
+    RET,
+)
+
+_PARSE_QUERY_STRING_TEMPLATE = (
+    _mov(0, BUF_MESSAGE),      # r0 = url/path
+    _mov(1, BUF_DATA_1),       # r1 = param name to find
+    # Find '?' in url
+    _load_byte(2, 0, 0),
+    _mov(3, 0x3F),             # '?'
+    _branch(BR_EQ, 2, 3, 3),
+    _branch(BR_EQ, 2, 0, 5),  # end of string
+    _alui(ALU_ADD, 0, 0, 1),
+    _branch(0, 0, 0, -5),
+    # Found '?', skip it
+    _alui(ALU_ADD, 0, 0, 1),
+    # Search for param name (stub)
+    _call(8),                   # find_param
+    RET,
+    # not found:
+    _mov(0, 0),
+    RET,
+    # find_param stub:
+    _mov(0, BUF_DATA_2),       # return value ptr
+    RET,
+)
+
+_PARSE_REQUEST_BODY_TEMPLATE = (
+    _mov(0, BUF_MESSAGE),      # r0 = request buffer
+    # Find "\r\n\r\n" (end of headers)
+    _load_byte(1, 0, 0),
+    _mov(2, 0x0D),             # '\r'
+    _branch(BR_NE, 1, 2, 3),
+    _load_byte(1, 0, 1),
+    _mov(2, 0x0A),             # '\n'
+    _branch(BR_NE, 1, 2, 6),
+    _load_byte(1, 0, 2),
+    _mov(2, 0x0D),
+    _branch(BR_NE, 1, 2, 4),
+    _load_byte(1, 0, 3),
+    _mov(2, 0x0A),
+    _branch(BR_EQ, 1, 2, 3),  # found!
+    _alui(ALU_ADD, 0, 0, 1),
+    _branch(0, 0, 0, -13),
+    # Found body start
+    _alui(ALU_ADD, 0, 0, 4),  # skip \r\n\r\n
+    RET,
+)
+
+_BUILD_JSON_RESPONSE_TEMPLATE = (
+    _mov(0, BUF_MESSAGE),      # r0 = response buffer
+    _mov(1, BUF_DATA_1),       # r1 = "HTTP/1.1 200 OK\r\n"
+    _call(16),                  # strcpy
+    _mov_reg(5, 0),            # save ptr
+    _mov(1, BUF_DATA_2),       # r1 = "Content-Type: application/json\r\n"
+    _call(16),
+    _mov(1, BUF_DATA_3),       # r1 = "Content-Length: "
+    _call(16),
+    # Calculate and add body length
+    _mov(0, BUF_DATA_4),       # r0 = json body
+    _call(20),                  # strlen
+    _mov_reg(6, 0),            # save length
+    _mov_reg(0, 5),            # restore ptr
+    _mov_reg(1, 6),            # length
+    _call(24),                  # itoa
+    _mov(1, BUF_DATA_5),       # r1 = "\r\n\r\n"
+    _call(16),
+    _mov(1, BUF_DATA_4),       # r1 = json body
+    _call(16),
+    RET,
+    # strcpy stub
+    RET,
+    # strlen stub
+    _mov(0, 64),
+    RET,
+    # itoa stub
+    RET,
+)
+
+_BUILD_RESPONSE_HEADERS_TEMPLATE = (
+    _mov(0, BUF_MESSAGE),      # r0 = response buffer (append position)
+    _mov(1, BUF_DATA_1),       # r1 = header name
+    _call(8),                   # strcpy
+    _mov(1, BUF_DATA_2),       # r1 = ": "
+    _call(8),
+    _mov(1, BUF_DATA_3),       # r1 = header value
+    _call(8),
+    _mov(1, BUF_DATA_4),       # r1 = "\r\n"
+    _call(8),
+    RET,
+    # strcpy stub
+    RET,
+)
+
+_SEND_REDIRECT_TEMPLATE = (
+    _mov(0, BUF_MESSAGE),      # r0 = response buffer
+    _mov(1, BUF_DATA_1),       # r1 = "HTTP/1.1 {code} {text}\r\n"
+    _call(10),                  # strcpy
+    _mov(1, BUF_DATA_2),       # r1 = "Location: "
+    _call(10),
+    _mov(1, BUF_DATA_3),       # r1 = redirect url
+    _call(10),
+    _mov(1, BUF_DATA_4),       # r1 = "\r\n\r\n"
+    _call(10),
+    # Send response
+    _mov(1, 11),               # socket fd
+    _mov(2, BUF_MESSAGE),
+    _mov(3, 128),
+    _net_send(0, 1, 2),
+    RET,
+    # strcpy stub
+    RET,
+)
+
+_METHOD_ROUTER_TEMPLATE = (
+    _mov(0, BUF_MESSAGE),      # r0 = request buffer
+    _load_byte(1, 0, 0),       # first char of method
+    # GET
+    _mov(2, 0x47),             # 'G'
+    _branch(BR_EQ, 1, 2, 10),  # handle_get
+    # POST
+    _mov(2, 0x50),             # 'P'
+    _branch(BR_EQ, 1, 2, 10),  # handle_post (needs more check)
+    # DELETE
+    _mov(2, 0x44),             # 'D'
+    _branch(BR_EQ, 1, 2, 10),  # handle_delete
+    # Method not allowed
+    _mov(0, 405),
+    _call(20),                  # send_error
+    RET,
+    # handle_get:
+    _call(22),
+    RET,
+    # handle_post:
+    _call(24),
+    RET,
+    # handle_delete:
+    _call(26),
+    RET,
+    # stubs
+    RET,
+    RET,
+    RET,
+    RET,
+)
+
+_CORS_PREFLIGHT_TEMPLATE = (
+    _mov(0, BUF_MESSAGE),      # r0 = response buffer
+    _mov(1, BUF_DATA_1),       # r1 = "HTTP/1.1 204 No Content\r\n"
+    _call(14),                  # strcpy
+    _mov(1, BUF_DATA_2),       # "Access-Control-Allow-Origin: *\r\n"
+    _call(14),
+    _mov(1, BUF_DATA_3),       # "Access-Control-Allow-Methods: GET, POST, PUT, DELETE\r\n"
+    _call(14),
+    _mov(1, BUF_DATA_4),       # "Access-Control-Allow-Headers: Content-Type, Authorization\r\n"
+    _call(14),
+    _mov(1, BUF_DATA_5),       # "\r\n"
+    _call(14),
+    # Send response
+    _mov(1, 11),
+    _mov(2, BUF_MESSAGE),
+    _mov(3, 256),
+    _net_send(0, 1, 2),
+    RET,
+    # strcpy stub
+    RET,
+)
 
 
 class HTTPPatternGenerator:
     """Generate HTTP protocol pattern samples."""
 
-    # Opcodes
-    OP_MOV = 0x1C
-    OP_LOAD = 0x03
-    OP_STORE = 0x04
-    OP_BRANCH = 0x06
-    OP_ALU = 0x00
-    OP_ALUI = 0x01
-    OP_CALL = 0x07
-    OP_RET = 0x08
-    OP_HALT = 0x1D
-    OP_NET = 0x15
-    OP_IO = 0x17
-
-    # ALU modes
-    ALU_ADD = 0
-    ALU_SUB = 1
-    ALU_AND = 2
-    ALU_OR = 3
-    ALU_XOR = 4
-
-    # Branch modes
-    BR_EQ = 0
-    BR_NE = 1
-    BR_LT = 2
-    BR_GE = 3
-
-    # Net modes
-    NET_SEND = 5
-    NET_RECV = 4
-
-    def __init__(self):
+    # Metadata shared by every generated sample (never mutated downstream)
+    _METADATA = {
+        'category': 'http-protocol',
+        'source': 'synthetic-http',
+    }
+
+    def __init__(self, seed: Optional[int] = None):
         """Initialize generator with pattern definitions."""
+        self._rng = random.Random(seed)
+
         self.patterns = [
             # Header parsing patterns (high weight)
             (15, self.gen_parse_content_type),
@@ -158,802 +979,210 @@ class HTTPPatternGenerator:
             (6, self.gen_cors_preflight),
         ]
 
-        total = sum(p[0] for p in self.patterns)
-        self.weights = [p[0] / total for p in self.patterns]
+        # Each pattern repeated weight times: an unweighted choice over this
+        # pool is an index lookup per draw instead of a bisect over cumulative
+        # weights, and with integer weights picks the same pattern for the
+        # same random() value
+        self._pattern_pool = tuple(fn for weight, fn in self.patterns for _ in range(weight))
+
+        # Prompt table and fixed instruction body per pattern, so batches can
+        # draw prompts per pattern and share one padded slot list
+        self._pattern_data = {
+            self.gen_parse_content_type: (_PARSE_CONTENT_TYPE_TABLE, _PARSE_CONTENT_TYPE_TEMPLATE),
+            self.gen_parse_authorization: (_PARSE_AUTHORIZATION_TABLE, _PARSE_AUTHORIZATION_TEMPLATE),
+            self.gen_parse_content_length: (_PARSE_CONTENT_LENGTH_TABLE, _PARSE_CONTENT_LENGTH_TEMPLATE),
+            self.gen_parse_accept_header: (_PARSE_ACCEPT_HEADER_TABLE, _PARSE_ACCEPT_HEADER_TEMPLATE),
+            self.gen_parse_cookie_header: (_PARSE_COOKIE_HEADER_TABLE, _PARSE_COOKIE_HEADER_TEMPLATE),
+            self.gen_parse_if_match: (_PARSE_IF_MATCH_TABLE, _PARSE_IF_MATCH_TEMPLATE),
+            self.gen_send_success_response: (_SEND_SUCCESS_RESPONSE_TABLE, _SEND_SUCCESS_RESPONSE_TEMPLATE),
+            self.gen_send_error_response: (_SEND_ERROR_RESPONSE_TABLE, _SEND_ERROR_RESPONSE_TEMPLATE),
+            self.gen_check_status_code: (_CHECK_STATUS_CODE_TABLE, _CHECK_STATUS_CODE_TEMPLATE),
+            self.gen_parse_http_method: (_PARSE_HTTP_METHOD_TABLE, _PARSE_HTTP_METHOD_TEMPLATE),
+            self.gen_parse_request_path: (_PARSE_REQUEST_PATH_TABLE, _PARSE_REQUEST_PATH_TEMPLATE),
+            self.gen_parse_query_string: (_PARSE_QUERY_STRING_TABLE, _PARSE_QUERY_STRING_TEMPLATE),
+            self.gen_parse_request_body: (_PARSE_REQUEST_BODY_TABLE, _PARSE_REQUEST_BODY_TEMPLATE),
+            self.gen_build_json_response: (_BUILD_JSON_RESPONSE_TABLE, _BUILD_JSON_RESPONSE_TEMPLATE),
+            self.gen_build_response_headers: (_BUILD_RESPONSE_HEADERS_TABLE, _BUILD_RESPONSE_HEADERS_TEMPLATE),
+            self.gen_send_redirect: (_SEND_REDIRECT_TABLE, _SEND_REDIRECT_TEMPLATE),
+            self.gen_method_router: (_METHOD_ROUTER_TABLE, _METHOD_ROUTER_TEMPLATE),
+            self.gen_cors_preflight: (_CORS_PREFLIGHT_TABLE, _CORS_PREFLIGHT_TEMPLATE),
+        }
+        self._padded = {
+            fn: _padded_slots(template)
+            for fn, (_, template) in self._pattern_data.items()
+        }
 
     def generate(self) -> Tuple[str, List[Instruction]]:
         """Generate a single training sample."""
-        idx = random.choices(range(len(self.patterns)), weights=self.weights)[0]
-        return self.patterns[idx][1]()
+        return self._rng.choices(self._pattern_pool)[0]()
 
     def generate_samples(self, count: int) -> List[Dict]:
         """Generate multiple training samples."""
-        samples = []
-        for _ in range(count):
-            prompt, instructions = self.generate()
-            samples.append({
-                'context': prompt,
-                'instructions': self._pad_instructions(instructions),
-                'metadata': {
-                    'category': 'http-protocol',
-                    'source': 'synthetic-http',
-                }
-            })
-        return samples
-
-    def _pad_instructions(self, instructions: List[Instruction], slots: int = 64) -> List[Dict]:
-        """Pad instruction list to fixed slots."""
-        result = [instr.to_dict() for instr in instructions]
-        while len(result) < slots:
-            result.append({
-                'valid': 0, 'opcode': 0, 'mode': 0, 'rd': 0,
-                'rs1': 0, 'rs2': 0, 'has_imm': 0, 'imm_bin': 0
-            })
-        return result[:slots]
-
-    def _mov(self, rd: int, imm: int) -> Instruction:
-        return Instruction(self.OP_MOV, 0, rd, 0, 0, 1, imm)
-
-    def _mov_reg(self, rd: int, rs: int) -> Instruction:
-        return Instruction(self.OP_MOV, 0, rd, rs, 0, 0, 0)
-
-    def _load_byte(self, rd: int, rs: int, offset: int = 0) -> Instruction:
-        return Instruction(self.OP_LOAD, 0, rd, rs, 0, 1, offset)
-
-    def _load_word(self, rd: int, rs: int, offset: int = 0) -> Instruction:
-        return Instruction(self.OP_LOAD, 3, rd, rs, 0, 1, offset)
-
-    def _store_byte(self, rs: int, rd: int, offset: int = 0) -> Instruction:
-        return Instruction(self.OP_STORE, 0, rd, rs, 0, 1, offset)
-
-    def _store_word(self, rs: int, rd: int, offset: int = 0) -> Instruction:
-        return Instruction(self.OP_STORE, 3, rd, rs, 0, 1, offset)
-
-    def _branch(self, mode: int, rs1: int, rs2: int, offset: int) -> Instruction:
-        return Instruction(self.OP_BRANCH, mode, 0, rs1, rs2, 1, offset)
-
-    def _alu(self, mode: int, rd: int, rs1: int, rs2: int) -> Instruction:
-        return Instruction(self.OP_ALU, mode, rd, rs1, rs2, 0, 0)
-
-    def _alui(self, mode: int, rd: int, rs: int, imm: int) -> Instruction:
-        return Instruction(self.OP_ALUI, mode, rd, rs, 0, 1, imm)
-
-    def _call(self, offset: int) -> Instruction:
-        return Instruction(self.OP_CALL, 0, 0, 0, 0, 1, offset)
-
-    def _ret(self) -> Instruction:
-        return Instruction(self.OP_RET, 0, 0, 0, 0, 0, 0)
-
-    def _halt(self) -> Instruction:
-        return Instruction(self.OP_HALT, 0, 0, 0, 0, 0, 0)
-
-    def _net_send(self, rd: int, fd: int, buf: int, flags: int = 0) -> Instruction:
-        return Instruction(self.OP_NET, self.NET_SEND, rd, fd, buf, 1, flags)
+        picks, prompts = self._draw_batch(count)
+        padded = self._padded
+        metadata = self._METADATA
+        return [
+            {'context': prompt, 'instructions': padded[fn], 'metadata': metadata}
+            for fn, prompt in zip(picks, prompts)
+        ]
 
-    def _net_recv(self, rd: int, fd: int, buf: int, flags: int = 0) -> Instruction:
-        return Instruction(self.OP_NET, self.NET_RECV, rd, fd, buf, 1, flags)
+    def _draw_batch(self, count: int) -> Tuple[List[Callable], List[str]]:
+        """Draw patterns for a batch, then each pattern's prompts in one call."""
+        picks = self._rng.choices(self._pattern_pool, k=count)
+        drawn = {
+            fn: iter(self._rng.choices(self._pattern_data[fn][0], k=n))
+            for fn, n in Counter(picks).items()
+        }
+        return picks, [next(drawn[fn]) for fn in picks]
+
+    def generate_samples_parallel(self, count: int, workers: Optional[int] = None,
+                                  seed: Optional[int] = None) -> List[Dict]:
+        """Generate multiple training samples across worker processes.
+
+        Each worker builds its own generator with a distinct seed, derived from
+        ``seed`` when given so runs are reproducible for a fixed worker count.
+        """
+        workers = min(workers or os.cpu_count() or 1, max(count, 1))
+        if workers <= 1:
+            return self.generate_samples(count)
+
+        if seed is None:
+            seeder = random.SystemRandom()
+            seeds = [seeder.randrange(2**32) for _ in range(workers)]
+        else:
+            seeds = [seed + i for i in range(workers)]
+        chunks = [count // workers + (1 if i < count % workers else 0) for i in range(workers)]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_generate_chunk, chunks, seeds)
+            return list(itertools.chain.from_iterable(results))
+
+    def generate_samples_columnar(self, count: int, slots: int = 64) -> Dict:
+        """Generate samples as columns instead of per-sample dicts.
+
+        Returns ``{'context': [str], 'instructions': bytes}`` where sample i
+        owns bytes ``i * slots * SLOT_SIZE`` onwards, so a consumer can view
+        the whole batch as a (count, slots) record array without parsing.
+        """
+        picks, prompts = self._draw_batch(count)
+        # Full zero-padded row per pattern, so assembly is a single join
+        rows = {fn: _packed_slots(template, slots)
+                for fn, (_, template) in self._pattern_data.items()}
+        return {'context': prompts, 'instructions': b''.join([rows[fn] for fn in picks])}
+
+    def generate_samples_to_npz(self, count: int, path: str, slots: int = 64) -> None:
+        """Generate samples and save them as a compressed .npz at path.
+
+        The instruction array is a zero-copy view of the columnar batch;
+        contexts are stored as a fixed-width unicode array so the file loads
+        without allow_pickle. numpy is only needed for this method.
+        """
+        import numpy as np
+
+        batch = self.generate_samples_columnar(count, slots)
+        instructions = np.frombuffer(batch['instructions'], dtype=np.dtype(SLOT_DTYPE))
+        np.savez_compressed(
+            path,
+            instructions=instructions.reshape(count, slots),
+            context=np.array(batch['context'], dtype=str),
+        )
 
     # ========================================================================
     # HEADER PARSING PATTERNS
     # ========================================================================
 
-    def gen_parse_content_type(self) -> Tuple[str, List[Instruction]]:
+    def gen_parse_content_type(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate Content-Type header parsing pattern."""
-        content_types = [
-            ('application/json', 'json'),
-            ('application/x-www-form-urlencoded', 'form'),
-            ('text/plain', 'text'),
-            ('multipart/form-data', 'multipart'),
-        ]
-        ct, short = random.choice(content_types)
-
-        prompts = [
-            "parse content-type header from request",
-            f"check if content-type is {ct}",
-            f"detect {short} content type",
-            "extract content-type from http headers",
-            "validate request content type",
-        ]
-
-        # Pattern: search for "Content-Type:" then compare value
-        instructions = [
-            self._mov(0, 0x1000),           # r0 = header buffer ptr
-            self._mov(1, 0x2000),           # r1 = "Content-Type:" pattern
-            self._call(10),                  # call find_header
-            self._branch(self.BR_EQ, 0, 0, 7),  # if not found, return 0
-            self._mov(1, 0x3000),           # r1 = expected content type
-            self._call(15),                  # call strcmp
-            self._mov_reg(5, 0),            # r5 = result
-            self._ret(),
-            # find_header: scan for header name
-            self._load_byte(2, 0, 0),       # load char
-            self._branch(self.BR_EQ, 2, 0, 3),  # if null, not found
-            self._alui(self.ALU_ADD, 0, 0, 1),  # advance ptr
-            self._branch(0, 0, 0, -3),      # loop
-            self._mov(0, 0),                # not found
-            self._ret(),
-            # strcmp:
-            self._load_byte(2, 0, 0),
-            self._load_byte(3, 1, 0),
-            self._branch(self.BR_NE, 2, 3, 4),  # if different, return 0
-            self._branch(self.BR_EQ, 2, 0, 3),  # if both null, return 1
-            self._alui(self.ALU_ADD, 0, 0, 1),
-            self._alui(self.ALU_ADD, 1, 1, 1),
-            self._branch(0, 0, 0, -6),
-            self._mov(0, 1),
-            self._ret(),
-            self._mov(0, 0),
-            self._ret(),
-        ]
+        return self._rng.choice(_PARSE_CONTENT_TYPE_TABLE), _PARSE_CONTENT_TYPE_TEMPLATE
 
-        return random.choice(prompts), instructions
-
-    def gen_parse_authorization(self) -> Tuple[str, List[Instruction]]:
+    def gen_parse_authorization(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate Authorization header parsing pattern."""
-        auth_types = ['Bearer', 'Basic', 'API-Key']
-        auth_type = random.choice(auth_types)
-
-        prompts = [
-            "parse authorization header from request",
-            f"extract {auth_type} token from authorization",
-            "get bearer token from authorization header",
-            "validate authorization header format",
-            "extract api key from authorization",
-        ]
-
-        instructions = [
-            self._mov(0, 0x1000),           # r0 = header buffer
-            self._mov(1, 0x2000),           # r1 = "Authorization:" pattern
-            self._call(8),                   # find_header
-            self._branch(self.BR_EQ, 0, 0, 5),  # if not found, error
-            # Skip "Bearer " prefix (7 chars)
-            self._alui(self.ALU_ADD, 0, 0, 7),
-            # Copy token to output
-            self._mov(1, 0x3000),           # r1 = output buffer
-            self._call(12),                  # copy_until_space
-            self._ret(),
-            # error:
-            self._mov(0, 0),
-            self._ret(),
-            # find_header stub
-            self._mov(0, 0x1100),           # mock found position
-            self._ret(),
-            # copy_until_space
-            self._load_byte(2, 0, 0),
-            self._mov(3, 0x20),             # space
-            self._branch(self.BR_EQ, 2, 3, 4),
-            self._branch(self.BR_EQ, 2, 0, 3),  # null terminator
-            self._store_byte(2, 1, 0),
-            self._alui(self.ALU_ADD, 0, 0, 1),
-            self._alui(self.ALU_ADD, 1, 1, 1),
-            self._branch(0, 0, 0, -6),
-            self._store_byte(0, 1, 0),      # null terminate
-            self._ret(),
-        ]
-
-        return random.choice(prompts), instructions
+        return self._rng.choice(_PARSE_AUTHORIZATION_TABLE), _PARSE_AUTHORIZATION_TEMPLATE
 
-    def gen_parse_content_length(self) -> Tuple[str, List[Instruction]]:
+    def gen_parse_content_length(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate Content-Length header parsing pattern."""
-        prompts = [
-            "parse content-length header",
-            "extract content length value",
-            "get request body size from content-length",
-            "read content-length as integer",
-            "parse http content length header",
-        ]
-
-        instructions = [
-            self._mov(0, 0x1000),           # r0 = headers buffer
-            self._mov(1, 0x2000),           # r1 = "Content-Length:" pattern
-            self._call(8),                   # find_header
-            self._branch(self.BR_EQ, 0, 0, 5),  # if not found, return 0
-            # Parse digits to integer
-            self._call(12),                  # atoi
-            self._ret(),
-            # error:
-            self._mov(0, 0),
-            self._ret(),
-            # find_header (stub)
-            self._mov(0, 0x1100),
-            self._ret(),
-            # atoi: parse decimal string to int
-            self._mov(1, 0),                # result = 0
-            self._load_byte(2, 0, 0),       # load char
-            self._mov(3, 0x30),             # '0'
-            self._alu(self.ALU_SUB, 4, 2, 3),  # digit = char - '0'
-            self._mov(5, 10),
-            self._branch(self.BR_GE, 4, 5, 4),  # if >= 10, done
-            self._branch(self.BR_LT, 4, 0, 3),  # if < 0, done (using zero reg)
-            # result = result * 10 + digit
-            self._mov(5, 10),
-            # (multiply by 10 using shifts and adds: x*10 = x*8 + x*2)
-            self._alui(self.ALU_ADD, 1, 1, 0),  # simplified: just accumulate
-            self._alui(self.ALU_ADD, 0, 0, 1),
-            self._branch(0, 0, 0, -9),
-            self._mov_reg(0, 1),
-            self._ret(),
-        ]
-
-        return random.choice(prompts), instructions
+        return self._rng.choice(_PARSE_CONTENT_LENGTH_TABLE), _PARSE_CONTENT_LENGTH_TEMPLATE
 
-    def gen_parse_accept_header(self) -> Tuple[str, List[Instruction]]:
+    def gen_parse_accept_header(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate Accept header parsing pattern."""
-        prompts = [
-            "parse accept header from request",
-            "check if client accepts json",
-            "extract accepted content types",
-            "validate accept header",
-            "determine response content type from accept",
-        ]
-
-        instructions = [
-            self._mov(0, 0x1000),           # r0 = headers
-            self._mov(1, 0x2000),           # r1 = "Accept:" pattern
-            self._call(6),                   # find_header
-            self._branch(self.BR_EQ, 0, 0, 3),  # if not found, use default
-            self._mov(1, 0x3000),           # r1 = "application/json"
-            self._call(10),                  # str_contains
-            self._ret(),
-            # default:
-            self._mov(0, 1),                # assume json accepted
-            self._ret(),
-            # find_header stub
-            self._mov(0, 0x1100),
-            self._ret(),
-            # str_contains stub
-            self._mov(0, 1),
-            self._ret(),
-        ]
-
-        return random.choice(prompts), instructions
+        return self._rng.choice(_PARSE_ACCEPT_HEADER_TABLE), _PARSE_ACCEPT_HEADER_TEMPLATE
 
-    def gen_parse_cookie_header(self) -> Tuple[str, List[Instruction]]:
+    def gen_parse_cookie_header(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate Cookie header parsing pattern."""
-        cookie_names = ['session', 'token', 'user_id', 'auth']
-        cookie = random.choice(cookie_names)
-
-        prompts = [
-            f"extract {cookie} cookie from request",
-            "parse cookie header values",
-            f"get {cookie} value from cookies",
-            "read session cookie from request",
-            "parse http cookie header",
-        ]
-
-        instructions = [
-            self._mov(0, 0x1000),           # r0 = headers
-            self._mov(1, 0x2000),           # r1 = "Cookie:" pattern
-            self._call(8),                   # find_header
-            self._branch(self.BR_EQ, 0, 0, 5),
-            # Find specific cookie name
-            self._mov(1, 0x3000),           # r1 = cookie name
-            self._call(12),                  # find_cookie_value
-            self._ret(),
-            # not found:
-            self._mov(0, 0),
-            self._ret(),
-            # find_header stub
-            self._mov(0, 0x1100),
-            self._ret(),
-            # find_cookie_value stub
-            self._mov(0, 0x4000),           # return value ptr
-            self._ret(),
-        ]
-
-        return random.choice(prompts), instructions
+        return self._rng.choice(_PARSE_COOKIE_HEADER_TABLE), _PARSE_COOKIE_HEADER_TEMPLATE
 
-    def gen_parse_if_match(self) -> Tuple[str, List[Instruction]]:
+    def gen_parse_if_match(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate If-Match/If-None-Match header parsing pattern."""
-        if random.random() > 0.5:
-            header = 'If-Match'
-            prompts = [
-                "parse if-match header for conditional update",
-                "extract etag from if-match header",
-                "check if-match precondition",
-                "validate etag for update request",
-            ]
-        else:
-            header = 'If-None-Match'
-            prompts = [
-                "parse if-none-match header for caching",
-                "extract etag from if-none-match",
-                "check cache validation header",
-                "validate if-none-match condition",
-            ]
-
-        instructions = [
-            self._mov(0, 0x1000),           # r0 = headers
-            self._mov(1, 0x2000),           # r1 = header pattern
-            self._call(6),                   # find_header
-            self._branch(self.BR_EQ, 0, 0, 3),
-            self._call(10),                  # parse_etag
-            self._ret(),
-            # not found:
-            self._mov(0, 0),
-            self._ret(),
-            # find_header stub
-            self._mov(0, 0x1100),
-            self._ret(),
-            # parse_etag stub
-            self._mov(0, 0x3000),
-            self._ret(),
-        ]
-
-        return random.choice(prompts), instructions
+        return self._rng.choice(_PARSE_IF_MATCH_TABLE), _PARSE_IF_MATCH_TEMPLATE
 
     # ========================================================================
     # STATUS CODE PATTERNS
     # ========================================================================
 
-    def gen_send_success_response(self) -> Tuple[str, List[Instruction]]:
+    def gen_send_success_response(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate success response sending pattern."""
-        success_codes = [(200, 'OK'), (201, 'Created'), (204, 'No Content')]
-        code, text = random.choice(success_codes)
-
-        prompts = [
-            f"send http {code} {text} response",
-            f"return {code} success response",
-            f"build and send {code} response",
-            f"respond with http {code}",
-            f"send {text.lower()} status code",
-        ]
+        return self._rng.choice(_SEND_SUCCESS_RESPONSE_TABLE), _SEND_SUCCESS_RESPONSE_TEMPLATE
 
-        instructions = [
-            self._mov(0, 0x1000),           # r0 = response buffer
-            # Build "HTTP/1.1 {code} {text}\r\n"
-            self._mov(1, 0x2000),           # r1 = status line template
-            self._call(10),                  # strcpy
-            # Add headers
-            self._mov(1, 0x3000),           # r1 = "Content-Type: application/json\r\n"
-            self._call(10),                  # strcat
-            self._mov(1, 0x4000),           # r1 = "Content-Length: "
-            self._call(10),
-            # Add body length
-            self._mov(1, 0),                # content length
-            self._call(14),                  # itoa
-            # CRLF CRLF
-            self._mov(1, 0x5000),           # r1 = "\r\n\r\n"
-            self._call(10),
-            # Send
-            self._mov(1, 11),               # r1 = socket fd (r11)
-            self._mov_reg(2, 0),            # r2 = response buffer
-            self._net_send(0, 1, 2),
-            self._ret(),
-            # strcpy stub
-            self._ret(),
-            # itoa stub
-            self._ret(),
-        ]
-
-        return random.choice(prompts), instructions
-
-    def gen_send_error_response(self) -> Tuple[str, List[Instruction]]:
+    def gen_send_error_response(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate error response sending pattern."""
-        error_codes = [
-            (400, 'Bad Request'),
-            (401, 'Unauthorized'),
-            (403, 'Forbidden'),
-            (404, 'Not Found'),
-            (500, 'Internal Server Error'),
-        ]
-        code, text = random.choice(error_codes)
-
-        prompts = [
-            f"send http {code} {text} error response",
-            f"return {code} error",
-            f"respond with {code} status",
-            f"build {text.lower()} error response",
-            f"send {code} with error body",
-        ]
+        return self._rng.choice(_SEND_ERROR_RESPONSE_TABLE), _SEND_ERROR_RESPONSE_TEMPLATE
 
-        instructions = [
-            self._mov(0, 0x1000),           # r0 = response buffer
-            # Build status line
-            self._mov(1, 0x2000),           # r1 = "HTTP/1.1 {code} {text}\r\n"
-            self._call(12),                  # strcpy
-            # Headers
-            self._mov(1, 0x3000),           # r1 = headers
-            self._call(12),                  # strcat
-            # Error body JSON
-            self._mov(1, 0x4000),           # r1 = '{"error":"..."}'
-            self._call(12),
-            # Send response
-            self._mov(1, 11),               # socket fd
-            self._mov_reg(2, 0),
-            self._mov(3, 256),              # length estimate
-            self._net_send(0, 1, 2),
-            self._ret(),
-            # strcpy stub
-            self._ret(),
-        ]
-
-        return random.choice(prompts), instructions
-
-    def gen_check_status_code(self) -> Tuple[str, List[Instruction]]:
+    def gen_check_status_code(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate status code checking pattern."""
-        prompts = [
-            "check if http status indicates success",
-            "validate response status code",
-            "check for 2xx success status",
-            "determine if request succeeded from status",
-            "check http response status",
-        ]
-
-        instructions = [
-            self._mov(1, 200),              # r1 = 200
-            self._branch(self.BR_LT, 0, 1, 6),  # if < 200, error
-            self._mov(1, 300),              # r1 = 300
-            self._branch(self.BR_GE, 0, 1, 4),  # if >= 300, error
-            # Success (2xx)
-            self._mov(0, 1),
-            self._ret(),
-            # Error
-            self._mov(0, 0),
-            self._ret(),
-        ]
-
-        return random.choice(prompts), instructions
+        return self._rng.choice(_CHECK_STATUS_CODE_TABLE), _CHECK_STATUS_CODE_TEMPLATE
 
     # ========================================================================
     # REQUEST HANDLING PATTERNS
     # ========================================================================
 
-    def gen_parse_http_method(self) -> Tuple[str, List[Instruction]]:
+    def gen_parse_http_method(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate HTTP method parsing pattern."""
-        prompts = [
-            "parse http method from request line",
-            "extract request method GET POST PUT DELETE",
-            "identify http method from request",
-            "check http request method",
-            "determine http method from first line",
-        ]
+        return self._rng.choice(_PARSE_HTTP_METHOD_TABLE), _PARSE_HTTP_METHOD_TEMPLATE
 
-        instructions = [
-            self._mov(0, 0x1000),           # r0 = request buffer
-            self._load_byte(1, 0, 0),       # first char
-            # Check 'G' for GET
-            self._mov(2, 0x47),             # 'G'
-            self._branch(self.BR_EQ, 1, 2, 8),  # goto is_get
-            # Check 'P' for POST/PUT/PATCH
-            self._mov(2, 0x50),             # 'P'
-            self._branch(self.BR_EQ, 1, 2, 8),  # goto is_p_method
-            # Check 'D' for DELETE
-            self._mov(2, 0x44),             # 'D'
-            self._branch(self.BR_EQ, 1, 2, 8),  # goto is_delete
-            # Check 'H' for HEAD
-            self._mov(2, 0x48),             # 'H'
-            self._branch(self.BR_EQ, 1, 2, 8),  # goto is_head
-            # Unknown method
-            self._mov(0, 0),
-            self._ret(),
-            # is_get:
-            self._mov(0, 1),                # GET = 1
-            self._ret(),
-            # is_p_method: check second char for POST vs PUT vs PATCH
-            self._load_byte(1, 0, 1),
-            self._mov(2, 0x4F),             # 'O' for POST
-            self._branch(self.BR_EQ, 1, 2, 3),
-            self._mov(0, 3),                # PUT = 3
-            self._ret(),
-            self._mov(0, 2),                # POST = 2
-            self._ret(),
-            # is_delete:
-            self._mov(0, 4),                # DELETE = 4
-            self._ret(),
-            # is_head:
-            self._mov(0, 5),                # HEAD = 5
-            self._ret(),
-        ]
-
-        return random.choice(prompts), instructions
-
-    def gen_parse_request_path(self) -> Tuple[str, List[Instruction]]:
+    def gen_parse_request_path(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate request path parsing pattern."""
-        prompts = [
-            "extract url path from http request",
-            "parse request path from request line",
-            "get path component from http request",
-            "extract uri path from request",
-            "parse path between method and http version",
-        ]
+        return self._rng.choice(_PARSE_REQUEST_PATH_TABLE), _PARSE_REQUEST_PATH_TEMPLATE
 
-        instructions = [
-            self._mov(0, 0x1000),           # r0 = request buffer
-            self._mov(1, 0x2000),           # r1 = path output buffer
-            # Skip method (find first space)
-            self._load_byte(2, 0, 0),
-            self._mov(3, 0x20),             # space
-            self._branch(self.BR_EQ, 2, 3, 2),
-            self._alui(self.ALU_ADD, 0, 0, 1),
-            self._branch(0, 0, 0, -4),
-            # Skip the space
-            self._alui(self.ALU_ADD, 0, 0, 1),
-            # Copy path until next space or ?
-            self._load_byte(2, 0, 0),
-            self._mov(3, 0x20),             # space
-            self._branch(self.BR_EQ, 2, 3, 6),
-            self._mov(3, 0x3F),             # '?'
-            self._branch(self.BR_EQ, 2, 3, 4),
-            self._store_byte(2, 1, 0),
-            self._alui(self.ALU_ADD, 0, 0, 1),
-            self._alui(self.ALU_ADD, 1, 1, 1),
-            self._branch(0, 0, 0, -8),
-            # Null terminate
-            self._store_byte(0, 1, 0),
-            self._ret(),
-        ]
-
-        return random.choice(prompts), instructions
-
-    def gen_parse_query_string(self) -> Tuple[str, List[Instruction]]:
+    def gen_parse_query_string(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate query string parsing pattern."""
-        params = ['id', 'page', 'limit', 'offset', 'search', 'filter']
-        param = random.choice(params)
-
-        prompts = [
-            f"parse query string parameter {param}",
-            "extract query parameters from url",
-            f"get {param} value from query string",
-            "parse url query string",
-            "decode query parameters from request",
-        ]
+        return self._rng.choice(_PARSE_QUERY_STRING_TABLE), _PARSE_QUERY_STRING_TEMPLATE
 
-        instructions = [
-            self._mov(0, 0x1000),           # r0 = url/path
-            self._mov(1, 0x2000),           # r1 = param name to find
-            # Find '?' in url
-            self._load_byte(2, 0, 0),
-            self._mov(3, 0x3F),             # '?'
-            self._branch(self.BR_EQ, 2, 3, 3),
-            self._branch(self.BR_EQ, 2, 0, 5),  # end of string
-            self._alui(self.ALU_ADD, 0, 0, 1),
-            self._branch(0, 0, 0, -5),
-            # Found '?', skip it
-            self._alui(self.ALU_ADD, 0, 0, 1),
-            # Search for param name (stub)
-            self._call(8),                   # find_param
-            self._ret(),
-            # not found:
-            self._mov(0, 0),
-            self._ret(),
-            # find_param stub:
-            self._mov(0, 0x3000),           # return value ptr
-            self._ret(),
-        ]
-
-        return random.choice(prompts), instructions
-
-    def gen_parse_request_body(self) -> Tuple[str, List[Instruction]]:
+    def gen_parse_request_body(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate request body parsing pattern."""
-        prompts = [
-            "extract body from http request",
-            "find request body after headers",
-            "parse http request body",
-            "get post body from request",
-            "extract payload from http request",
-        ]
-
-        instructions = [
-            self._mov(0, 0x1000),           # r0 = request buffer
-            # Find "\r\n\r\n" (end of headers)
-            self._load_byte(1, 0, 0),
-            self._mov(2, 0x0D),             # '\r'
-            self._branch(self.BR_NE, 1, 2, 3),
-            self._load_byte(1, 0, 1),
-            self._mov(2, 0x0A),             # '\n'
-            self._branch(self.BR_NE, 1, 2, 6),
-            self._load_byte(1, 0, 2),
-            self._mov(2, 0x0D),
-            self._branch(self.BR_NE, 1, 2, 4),
-            self._load_byte(1, 0, 3),
-            self._mov(2, 0x0A),
-            self._branch(self.BR_EQ, 1, 2, 3),  # found!
-            self._alui(self.ALU_ADD, 0, 0, 1),
-            self._branch(0, 0, 0, -13),
-            # Found body start
-            self._alui(self.ALU_ADD, 0, 0, 4),  # skip \r\n\r\n
-            self._ret(),
-        ]
-
-        return random.choice(prompts), instructions
+        return self._rng.choice(_PARSE_REQUEST_BODY_TABLE), _PARSE_REQUEST_BODY_TEMPLATE
 
     # ========================================================================
     # RESPONSE BUILDING PATTERNS
     # ========================================================================
 
-    def gen_build_json_response(self) -> Tuple[str, List[Instruction]]:
+    def gen_build_json_response(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate JSON response building pattern."""
-        prompts = [
-            "build json http response",
-            "create json response with headers",
-            "format json response body",
-            "construct http json response",
-            "build rest api json response",
-        ]
-
-        instructions = [
-            self._mov(0, 0x1000),           # r0 = response buffer
-            self._mov(1, 0x2000),           # r1 = "HTTP/1.1 200 OK\r\n"
-            self._call(16),                  # strcpy
-            self._mov_reg(5, 0),            # save ptr
-            self._mov(1, 0x3000),           # r1 = "Content-Type: application/json\r\n"
-            self._call(16),
-            self._mov(1, 0x4000),           # r1 = "Content-Length: "
-            self._call(16),
-            # Calculate and add body length
-            self._mov(0, 0x5000),           # r0 = json body
-            self._call(20),                  # strlen
-            self._mov_reg(6, 0),            # save length
-            self._mov_reg(0, 5),            # restore ptr
-            self._mov_reg(1, 6),            # length
-            self._call(24),                  # itoa
-            self._mov(1, 0x6000),           # r1 = "\r\n\r\n"
-            self._call(16),
-            self._mov(1, 0x5000),           # r1 = json body
-            self._call(16),
-            self._ret(),
-            # strcpy stub
-            self._ret(),
-            # strlen stub
-            self._mov(0, 64),
-            self._ret(),
-            # itoa stub
-            self._ret(),
-        ]
-
-        return random.choice(prompts), instructions
+        return self._rng.choice(_BUILD_JSON_RESPONSE_TABLE), _BUILD_JSON_RESPONSE_TEMPLATE
 
-    def gen_build_response_headers(self) -> Tuple[str, List[Instruction]]:
+    def gen_build_response_headers(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate response header building pattern."""
-        headers = [
-            ('Cache-Control', 'no-cache'),
-            ('ETag', '"abc123"'),
-            ('X-Request-ID', 'req-123'),
-        ]
-        header, value = random.choice(headers)
-
-        prompts = [
-            f"add {header} header to response",
-            "build http response headers",
-            f"set {header} response header",
-            "construct response header section",
-            "append header to http response",
-        ]
+        return self._rng.choice(_BUILD_RESPONSE_HEADERS_TABLE), _BUILD_RESPONSE_HEADERS_TEMPLATE
 
-        instructions = [
-            self._mov(0, 0x1000),           # r0 = response buffer (append position)
-            self._mov(1, 0x2000),           # r1 = header name
-            self._call(8),                   # strcpy
-            self._mov(1, 0x3000),           # r1 = ": "
-            self._call(8),
-            self._mov(1, 0x4000),           # r1 = header value
-            self._call(8),
-            self._mov(1, 0x5000),           # r1 = "\r\n"
-            self._call(8),
-            self._ret(),
-            # strcpy stub
-            self._ret(),
-        ]
-
-        return random.choice(prompts), instructions
-
-    def gen_send_redirect(self) -> Tuple[str, List[Instruction]]:
+    def gen_send_redirect(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate redirect response pattern."""
-        codes = [(301, 'Moved Permanently'), (302, 'Found'), (307, 'Temporary Redirect')]
-        code, text = random.choice(codes)
-
-        prompts = [
-            f"send http {code} redirect response",
-            f"redirect client with {code} status",
-            "send redirect with location header",
-            f"return {text.lower()} redirect",
-            "build redirect response with location",
-        ]
-
-        instructions = [
-            self._mov(0, 0x1000),           # r0 = response buffer
-            self._mov(1, 0x2000),           # r1 = "HTTP/1.1 {code} {text}\r\n"
-            self._call(10),                  # strcpy
-            self._mov(1, 0x3000),           # r1 = "Location: "
-            self._call(10),
-            self._mov(1, 0x4000),           # r1 = redirect url
-            self._call(10),
-            self._mov(1, 0x5000),           # r1 = "\r\n\r\n"
-            self._call(10),
-            # Send response
-            self._mov(1, 11),               # socket fd
-            self._mov(2, 0x1000),
-            self._mov(3, 128),
-            self._net_send(0, 1, 2),
-            self._ret(),
-            # strcpy stub
-            self._ret(),
-        ]
-
-        return random.choice(prompts), instructions
+        return self._rng.choice(_SEND_REDIRECT_TABLE), _SEND_REDIRECT_TEMPLATE
 
     # ========================================================================
     # METHOD ROUTING PATTERNS
     # ========================================================================
 
-    def gen_method_router(self) -> Tuple[str, List[Instruction]]:
+    def gen_method_router(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate HTTP method routing pattern."""
-        prompts = [
-            "route request by http method",
-            "dispatch handler based on method",
-            "create method router for http requests",
-            "switch on http method type",
-            "route to handler by request method",
-        ]
-
-        instructions = [
-            self._mov(0, 0x1000),           # r0 = request buffer
-            self._load_byte(1, 0, 0),       # first char of method
-            # GET
-            self._mov(2, 0x47),             # 'G'
-            self._branch(self.BR_EQ, 1, 2, 10),  # handle_get
-            # POST
-            self._mov(2, 0x50),             # 'P'
-            self._branch(self.BR_EQ, 1, 2, 10),  # handle_post (needs more check)
-            # DELETE
-            self._mov(2, 0x44),             # 'D'
-            self._branch(self.BR_EQ, 1, 2, 10),  # handle_delete
-            # Method not allowed
-            self._mov(0, 405),
-            self._call(20),                  # send_error
-            self._ret(),
-            # handle_get:
-            self._call(22),
-            self._ret(),
-            # handle_post:
-            self._call(24),
-            self._ret(),
-            # handle_delete:
-            self._call(26),
-            self._ret(),
-            # stubs
-            self._ret(),
-            self._ret(),
-            self._ret(),
-            self._ret(),
-        ]
-
-        return random.choice(prompts), instructions
+        return self._rng.choice(_METHOD_ROUTER_TABLE), _METHOD_ROUTER_TEMPLATE
 
-    def gen_cors_preflight(self) -> Tuple[str, List[Instruction]]:
+    def gen_cors_preflight(self) -> Tuple[str, Sequence[Instruction]]:
         """Generate CORS preflight response pattern."""
-        prompts = [
-            "handle cors preflight options request",
-            "respond to cors preflight with headers",
-            "build cors preflight response",
-            "handle options request for cors",
-            "send access-control-allow headers",
-        ]
+        return self._rng.choice(_CORS_PREFLIGHT_TABLE), _CORS_PREFLIGHT_TEMPLATE
 
-        instructions = [
-            self._mov(0, 0x1000),           # r0 = response buffer
-            self._mov(1, 0x2000),           # r1 = "HTTP/1.1 204 No Content\r\n"
-            self._call(14),                  # strcpy
-            self._mov(1, 0x3000),           # "Access-Control-Allow-Origin: *\r\n"
-            self._call(14),
-            self._mov(1, 0x4000),           # "Access-Control-Allow-Methods: GET, POST, PUT, DELETE\r\n"
-            self._call(14),
-            self._mov(1, 0x5000),           # "Access-Control-Allow-Headers: Content-Type, Authorization\r\n"
-            self._call(14),
-            self._mov(1, 0x6000),           # "\r\n"
-            self._call(14),
-            # Send response
-            self._mov(1, 11),
-            self._mov(2, 0x1000),
-            self._mov(3, 256),
-            self._net_send(0, 1, 2),
-            self._ret(),
-            # strcpy stub
-            self._ret(),
-        ]
 
-        return random.choice(prompts), instructions
+def _generate_chunk(count: int, seed: int) -> List[Dict]:
+    """Worker entry point for generate_samples_parallel."""
+    return HTTPPatternGenerator(seed=seed).generate_samples(count)
 
 
 def main():
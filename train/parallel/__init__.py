@@ -9,20 +9,32 @@ from .model import (
     ParallelInstructionModel,
     LightParallelModel,
     ParallelInstructionLoss,
+    losses_to_dict,
+    valid_slot_indices,
+    compile_model,
     NUM_SLOTS,
     NUM_OPCODES,
     NUM_MODES,
     NUM_REGISTERS,
     IMM_BINS,
+    HEAD_NAMES,
+    HEAD_SIZES,
+    LOSS_NAMES,
 )
 
 __all__ = [
     'ParallelInstructionModel',
     'LightParallelModel',
     'ParallelInstructionLoss',
+    'losses_to_dict',
+    'valid_slot_indices',
+    'compile_model',
     'NUM_SLOTS',
     'NUM_OPCODES',
     'NUM_MODES',
     'NUM_REGISTERS',
     'IMM_BINS',
+    'HEAD_NAMES',
+    'HEAD_SIZES',
+    'LOSS_NAMES',
 ]
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Knowledge Distillation: ParallelInstructionModel -> LightParallelModel
+
+Trains the light model against a trained full model's softened per-slot
+distributions (KL divergence at temperature T, scaled by T^2) blended with the
+usual hard-label loss. The distilled model exports with
+export_onnx.py --light, and with --quantize for an INT8 deployment.
+
+Usage:
+    python distill.py --data training_data_parallel.jsonl --teacher checkpoints/best_model.pt \\
+        --output models/light.pt --epochs 20
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+import torch.optim as optim
+from torch.utils.data import DataLoader, random_split
+from tqdm import tqdm
+
+from parallel.model import (
+    ParallelInstructionModel,
+    LightParallelModel,
+    ParallelInstructionLoss,
+    HEAD_NAMES,
+)
+from parallel.train import ParallelDataset, collate_fn, batch_to_device, evaluate
+
+
+def load_teacher(path: str, max_seq_len: int, device: torch.device) -> ParallelInstructionModel:
+    """Load a trained full model (checkpoint or bare state_dict) for inference."""
+    checkpoint = torch.load(path, map_location='cpu', weights_only=False)
+    state_dict = checkpoint.get('model_state_dict', checkpoint)
+
+    # Same architecture detection as export_onnx.py
+    norm = 'batch' if 'encoder.2.running_mean' in state_dict else 'group'
+    share_kv = torch.equal(
+        state_dict['cross_attention.0.k_proj.weight'],
+        state_dict['cross_attention.1.k_proj.weight'],
+    )
+    teacher = ParallelInstructionModel(max_seq_len=max_seq_len, norm=norm, share_kv=share_kv)
+    teacher.load_state_dict(state_dict)
+    return teacher.to(device).eval()
+
+
+def distillation_loss(
+    student: Dict[str, torch.Tensor],
+    teacher: Dict[str, torch.Tensor],
+    valid_mask: torch.Tensor,
+    head_weights: torch.Tensor,
+    temperature: float,
+) -> torch.Tensor:
+    """
+    Weighted per-head KL(teacher || student) at the given temperature.
+
+    Like the hard-label loss, every slot counts for the 'valid' head and only
+    valid slots for the others.
+    """
+    valid_mask = valid_mask.float()
+    total = 0.0
+    for i, name in enumerate(HEAD_NAMES):
+        kl = F.kl_div(
+            F.log_softmax(student[name].float() / temperature, dim=-1),
+            F.log_softmax(teacher[name].float() / temperature, dim=-1),
+            reduction='none',
+            log_target=True,
+        ).sum(dim=-1)  # (batch, num_slots)
+
+        if name == 'valid':
+            kl = kl.mean()
+        else:
+            kl = (kl * valid_mask).sum() / (valid_mask.sum() + 1e-8)
+        total = total + head_weights[i] * kl
+
+    return total * temperature ** 2
+
+
+def distill_epoch(
+    student: nn.Module,
+    teacher: nn.Module,
+    loader: DataLoader,
+    criterion: ParallelInstructionLoss,
+    optimizer: optim.Optimizer,
+    device: torch.device,
+    temperature: float,
+    alpha: float,
+    log_interval: int = 50,
+) -> Dict[str, float]:
+    """Train the student for one epoch; the progress bar updates every log_interval steps."""
+    student.train()
+
+    # kd and hard loss sums, accumulated on device
+    loss_sum = torch.zeros(2, device=device)
+    num_batches = 0
+
+    pbar = tqdm(loader, desc="Distilling")
+    for batch in pbar:
+        tokens, targets = batch_to_device(batch, device)
+
+        with torch.no_grad():
+            teacher_logits = teacher(tokens)
+
+        optimizer.zero_grad(set_to_none=True)
+        student_logits = student(tokens)
+        hard_loss, _ = criterion(student_logits, targets)
+        kd_loss = distillation_loss(
+            student_logits, teacher_logits, targets['valid'], criterion.head_weights, temperature,
+        )
+        loss = alpha * kd_loss + (1 - alpha) * hard_loss
+        loss.backward()
+        torch.nn.utils.clip_grad_norm_(student.parameters(), 1.0)
+        optimizer.step()
+
+        loss_sum += torch.stack([kd_loss, hard_loss]).detach()
+        num_batches += 1
+
+        if num_batches % log_interval == 0:
+            total_kd, total_hard = loss_sum.tolist()
+            pbar.set_postfix({
+                'kd': f"{total_kd / num_batches:.4f}",
+                'hard': f"{total_hard / num_batches:.4f}",
+            })
+
+    total_kd, total_hard = loss_sum.tolist()
+    return {'kd': total_kd / num_batches, 'hard': total_hard / num_batches}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distill the full model into LightParallelModel")
+    parser.add_argument('--data', type=str, required=True, help="Training data JSONL file")
+    parser.add_argument('--teacher', type=str, required=True, help="Trained ParallelInstructionModel checkpoint")
+    parser.add_argument('--output', type=str, default='models/light.pt', help="Output student model path")
+    parser.add_argument('--epochs', type=int, default=20, help="Number of epochs")
+    parser.add_argument('--batch-size', type=int, default=64, help="Batch size")
+    parser.add_argument('--lr', type=float, default=1e-3, help="Learning rate")
+    parser.add_argument('--temperature', type=float, default=4.0, help="Distillation temperature")
+    parser.add_argument('--alpha', type=float, default=0.7, help="Weight of the distillation loss vs hard labels")
+    parser.add_argument('--val-split', type=float, default=0.1, help="Validation split")
+    parser.add_argument('--device', type=str, default='cuda' if torch.cuda.is_available() else 'cpu')
+    parser.add_argument('--max-samples', type=int, default=None, help="Max training samples")
+    parser.add_argument('--max-seq-len', type=int, default=256, help="Max sequence length")
+    parser.add_argument('--num-workers', type=int, default=4, help="DataLoader workers")
+    args = parser.parse_args()
+
+    device = torch.device(args.device)
+    print(f"Using device: {device}")
+
+    dataset = ParallelDataset(args.data, max_seq_len=args.max_seq_len, max_samples=args.max_samples)
+    val_size = int(len(dataset) * args.val_split)
+    train_dataset, val_dataset = random_split(dataset, [len(dataset) - val_size, val_size])
+
+    loader_kwargs = dict(
+        batch_size=args.batch_size,
+        num_workers=args.num_workers,
+        pin_memory=args.device == 'cuda',
+        collate_fn=collate_fn,
+    )
+    train_loader = DataLoader(train_dataset, shuffle=True, **loader_kwargs)
+    val_loader = DataLoader(val_dataset, shuffle=False, **loader_kwargs)
+
+    print(f"Loading teacher from {args.teacher}...")
+    teacher = load_teacher(args.teacher, args.max_seq_len, device)
+    student = LightParallelModel().to(device)
+    print(f"Teacher parameters: {teacher.count_parameters():,}")
+    print(f"Student parameters: {student.count_parameters():,}")
+
+    criterion = ParallelInstructionLoss().to(device)
+    optimizer = optim.AdamW(student.parameters(), lr=args.lr, weight_decay=0.01)
+    scheduler = optim.lr_scheduler.CosineAnnealingLR(optimizer, T_max=args.epochs)
+
+    output_path = Path(args.output).with_suffix('.pt')
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    best_opcode_acc = 0.0
+
+    for epoch in range(args.epochs):
+        print(f"\nEpoch {epoch + 1}/{args.epochs}")
+
+        train_losses = distill_epoch(
+            student, teacher, train_loader, criterion, optimizer, device, args.temperature, args.alpha,
+        )
+        print(f"Train - KD: {train_losses['kd']:.4f}, Hard: {train_losses['hard']:.4f}")
+
+        val_losses = evaluate(student, val_loader, criterion, device)
+        print(f"Val - Loss: {val_losses['total']:.4f}, "
+              f"Valid Acc: {val_losses['valid_acc']:.4f}, "
+              f"Opcode Acc: {val_losses['opcode_acc']:.4f}")
+
+        if val_losses['opcode_acc'] > best_opcode_acc:
+            best_opcode_acc = val_losses['opcode_acc']
+            torch.save(student.state_dict(), output_path)
+            print(f"  -> Saved best student (opcode_acc: {best_opcode_acc:.4f})")
+
+        scheduler.step()
+
+    print(f"\nDistillation complete. Best opcode accuracy: {best_opcode_acc:.4f}")
+    print(f"Model saved to: {output_path}")
+
+    config = {
+        'model_type': 'light',
+        'max_seq_len': args.max_seq_len,
+        'teacher': args.teacher,
+        'temperature': args.temperature,
+        'alpha': args.alpha,
+        'best_opcode_acc': best_opcode_acc,
+    }
+    config_path = output_path.with_suffix('.config.json')
+    with open(config_path, 'w') as f:
+        json.dump(config, f, indent=2)
+    print(f"Config saved to: {config_path}")
+
+
+if __name__ == "__main__":
+    main()
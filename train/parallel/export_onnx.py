@@ -4,10 +4,39 @@ Export trained parallel model to ONNX format for Rust inference.
 
 Usage:
     python train/parallel/export_onnx.py --model models/model.pt --output models/parallel.onnx
+
+    # INT8 weights via onnxruntime quantization (dynamic or calibrated static)
+    python train/parallel/export_onnx.py --quantize dynamic --output models/parallel_int8.onnx
+
+    # FP16 weights/activations for GPU tensor cores (input_ids stays int64,
+    # outputs stay float32)
+    python train/parallel/export_onnx.py --fp16 --output models/parallel_fp16.onnx
+
+The FP16 model is meant for onnxruntime's CUDA provider; with the fixed
+input shape CUDA graphs can be enabled to skip per-call launch overhead:
+    ort.InferenceSession(path, providers=[
+        ('CUDAExecutionProvider', {'enable_cuda_graph': True}),
+    ])
+
+--argmax appends an ArgMax per head, so each output is the (batch, 64) int64
+class index instead of (batch, 64, classes) logits -- for consumers that only
+decode the top prediction (output names are unchanged).
+
+--static-shape drops the dynamic batch axis and writes two fixed-shape graphs,
+parallel.onnx for (1, max_seq_len) and parallel_batch8.onnx for
+(8, max_seq_len). Fixed shapes let onnxruntime pre-plan memory and fold
+shape computations; persist the optimized graph once with
+    opts = ort.SessionOptions()
+    opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    opts.optimized_model_filepath = 'models/parallel.opt.onnx'
+and with TensorRT one engine per shape can be cached via the
+TensorrtExecutionProvider option {'trt_engine_cache_enable': True}.
 """
 
 import argparse
+import os
 import sys
+import tempfile
 from pathlib import Path
 
 import torch
@@ -15,9 +44,139 @@ import torch
 sys.path.insert(0, str(Path(__file__).parent))
 from model import ParallelInstructionModel, LightParallelModel
 
+# Batch size of the second graph written by --static-shape
+STATIC_BATCH_SIZE = 8
+
+
+def quantize_onnx(
+    fp32_path: str,
+    output_path: str,
+    mode: str,
+    max_seq_len: int = 256,
+    calibration_samples: int = 256,
+    batch_size: int = 1,
+):
+    """Quantize an exported FP32 ONNX model to INT8 with onnxruntime."""
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        QuantType,
+        quantize_dynamic,
+        quantize_static,
+    )
+
+    if mode == 'dynamic':
+        # INT8 weights, activations quantized on the fly per batch
+        quantize_dynamic(fp32_path, output_path, weight_type=QuantType.QInt8)
+        return
+
+    import numpy as np
+
+    class RandomTokenReader(CalibrationDataReader):
+        """Feeds random byte-token sequences for activation range calibration."""
+
+        def __init__(self):
+            rng = np.random.default_rng(0)
+            self.batches = iter(
+                {'input_ids': rng.integers(0, 256, (batch_size, max_seq_len), dtype=np.int64)}
+                for _ in range(calibration_samples)
+            )
+
+        def get_next(self):
+            return next(self.batches, None)
+
+    quantize_static(
+        fp32_path,
+        output_path,
+        RandomTokenReader(),
+        per_channel=True,
+        activation_type=QuantType.QInt8,
+        weight_type=QuantType.QInt8,
+    )
+
+
+def write_onnx(
+    wrapped_model: torch.nn.Module,
+    dummy_input: torch.Tensor,
+    output_path: str,
+    max_seq_len: int,
+    quantize: str = 'none',
+    fp16: bool = False,
+    static_shape: bool = False,
+):
+    """Trace the wrapped model to ONNX, post-process it and verify the file."""
+    # Quantized exports trace to a temporary FP32 model first
+    tmp_dir = tempfile.TemporaryDirectory() if quantize != 'none' else None
+    fp32_path = os.path.join(tmp_dir.name, 'fp32.onnx') if tmp_dir else output_path
+
+    # Export
+    torch.onnx.export(
+        wrapped_model,
+        dummy_input,
+        fp32_path,
+        export_params=True,
+        opset_version=14,
+        do_constant_folding=True,
+        input_names=['input_ids'],
+        output_names=['valid', 'opcode', 'mode', 'rd', 'rs1', 'rs2', 'has_imm', 'imm_bin'],
+        dynamic_axes=None if static_shape else {
+            'input_ids': {0: 'batch_size'},
+            'valid': {0: 'batch_size'},
+            'opcode': {0: 'batch_size'},
+            'mode': {0: 'batch_size'},
+            'rd': {0: 'batch_size'},
+            'rs1': {0: 'batch_size'},
+            'rs2': {0: 'batch_size'},
+            'has_imm': {0: 'batch_size'},
+            'imm_bin': {0: 'batch_size'},
+        }
+    )
+
+    if tmp_dir:
+        print(f"Quantizing to INT8 ({quantize})...")
+        quantize_onnx(fp32_path, output_path, quantize, max_seq_len, batch_size=dummy_input.size(0))
+        tmp_dir.cleanup()
+
+    if fp16:
+        print("Converting to FP16...")
+        import onnx
+        from onnxconverter_common import float16
+        onnx_model = float16.convert_float_to_float16(onnx.load(output_path), keep_io_types=True)
+        onnx.save(onnx_model, output_path)
+
+    print(f"Exported to {output_path}")
+
+    # Verify
+    import onnx
+    onnx_model = onnx.load(output_path)
+    onnx.checker.check_model(onnx_model)
+    print("ONNX model verified successfully!")
+
+    if quantize != 'none':
+        # Make sure onnxruntime can run the quantized operators on CPU
+        import onnxruntime as ort
+        session = ort.InferenceSession(output_path, providers=['CPUExecutionProvider'])
+        session.run(None, {'input_ids': dummy_input.numpy()})
+        print("Quantized model runs on CPUExecutionProvider")
 
-def export_to_onnx(model_path: str, output_path: str, max_seq_len: int = 256, light: bool = False):
+    # Print model size
+    size_mb = os.path.getsize(output_path) / (1024 * 1024)
+    print(f"Model size: {size_mb:.2f} MB")
+
+
+def export_to_onnx(
+    model_path: str,
+    output_path: str,
+    max_seq_len: int = 256,
+    light: bool = False,
+    quantize: str = 'none',
+    fp16: bool = False,
+    static_shape: bool = False,
+    argmax: bool = False,
+):
     """Export parallel model to ONNX format."""
+    if fp16 and quantize != 'none':
+        raise ValueError("fp16 and quantize are mutually exclusive")
+
     print(f"Loading model from {model_path}...")
 
     # Load checkpoint - supports both full checkpoint and state_dict only
@@ -39,16 +198,30 @@ def export_to_onnx(model_path: str, output_path: str, max_seq_len: int = 256, li
         model = LightParallelModel()
         print("Using LightParallelModel")
     else:
-        model = ParallelInstructionModel(max_seq_len=max_seq_len)
-        print("Using ParallelInstructionModel")
+        # BatchNorm checkpoints carry running stats; GroupNorm ones do not
+        norm = 'batch' if 'encoder.2.running_mean' in state_dict else 'group'
+        # Tied K/V projections are saved under both layers with equal values
+        share_kv = torch.equal(
+            state_dict['cross_attention.0.k_proj.weight'],
+            state_dict['cross_attention.1.k_proj.weight'],
+        )
+        # Inputs are always max_seq_len long here; a fixed positional encoding
+        # lets constant folding bake it into the graph
+        model = ParallelInstructionModel(max_seq_len=max_seq_len, fixed_seq_len=max_seq_len,
+                                         norm=norm, share_kv=share_kv)
+        print(f"Using ParallelInstructionModel ({norm} norm)")
 
     # Load weights
     model.load_state_dict(state_dict)
     model.eval()
 
+    # Fold encoder BatchNorms so the exported graph ships the fused weights
+    if not light:
+        model.fuse_for_inference()
+
     print(f"Model parameters: {model.count_parameters():,}")
 
-    # Create dummy input
+    # Create dummy input (with static_shape this is the exported shape)
     batch_size = 1
     seq_len = max_seq_len
     dummy_input = torch.randint(0, 256, (batch_size, seq_len), dtype=torch.long)
@@ -63,12 +236,17 @@ def export_to_onnx(model_path: str, output_path: str, max_seq_len: int = 256, li
 
     # Create wrapper that returns tuple instead of dict (required for ONNX)
     class ModelWrapper(torch.nn.Module):
-        def __init__(self, model):
+        def __init__(self, model, argmax=False):
             super().__init__()
             self.model = model
+            self.argmax = argmax
 
         def forward(self, x):
             output = self.model(x)
+            if self.argmax:
+                # Class indices instead of logits: the reductions run inside
+                # the ORT graph rather than in the caller
+                output = {name: torch.argmax(logits, dim=-1) for name, logits in output.items()}
             # Return in fixed order
             return (
                 output['valid'],
@@ -81,44 +259,17 @@ def export_to_onnx(model_path: str, output_path: str, max_seq_len: int = 256, li
                 output['imm_bin'],
             )
 
-    wrapped_model = ModelWrapper(model)
+    wrapped_model = ModelWrapper(model, argmax)
     wrapped_model.eval()
 
-    # Export
-    torch.onnx.export(
-        wrapped_model,
-        dummy_input,
-        output_path,
-        export_params=True,
-        opset_version=14,
-        do_constant_folding=True,
-        input_names=['input_ids'],
-        output_names=['valid', 'opcode', 'mode', 'rd', 'rs1', 'rs2', 'has_imm', 'imm_bin'],
-        dynamic_axes={
-            'input_ids': {0: 'batch_size'},
-            'valid': {0: 'batch_size'},
-            'opcode': {0: 'batch_size'},
-            'mode': {0: 'batch_size'},
-            'rd': {0: 'batch_size'},
-            'rs1': {0: 'batch_size'},
-            'rs2': {0: 'batch_size'},
-            'has_imm': {0: 'batch_size'},
-            'imm_bin': {0: 'batch_size'},
-        }
-    )
+    write_onnx(wrapped_model, dummy_input, output_path, max_seq_len, quantize, fp16, static_shape)
 
-    print(f"Exported to {output_path}")
-
-    # Verify
-    import onnx
-    onnx_model = onnx.load(output_path)
-    onnx.checker.check_model(onnx_model)
-    print("ONNX model verified successfully!")
-
-    # Print model size
-    import os
-    size_mb = os.path.getsize(output_path) / (1024 * 1024)
-    print(f"Model size: {size_mb:.2f} MB")
+    if static_shape:
+        # Second specialization for throughput-oriented batched calls
+        batch_path = Path(output_path)
+        batch_path = str(batch_path.with_name(f"{batch_path.stem}_batch{STATIC_BATCH_SIZE}{batch_path.suffix}"))
+        batch_input = torch.randint(0, 256, (STATIC_BATCH_SIZE, max_seq_len), dtype=torch.long)
+        write_onnx(wrapped_model, batch_input, batch_path, max_seq_len, quantize, fp16, static_shape)
 
     return output_path
 
@@ -129,9 +280,20 @@ def main():
     parser.add_argument("--output", type=str, default="models/parallel.onnx", help="Output ONNX model")
     parser.add_argument("--max-seq-len", type=int, default=256, help="Max sequence length")
     parser.add_argument("--light", action="store_true", help="Use lightweight model")
+    parser.add_argument("--quantize", choices=["none", "dynamic", "static"], default="none",
+                        help="INT8 quantization of the exported model (needs onnxruntime)")
+    parser.add_argument("--fp16", action="store_true",
+                        help="Convert weights/activations to FP16 (needs onnxconverter-common)")
+    parser.add_argument("--argmax", action="store_true",
+                        help="Output int64 class indices (batch, 64) per head instead of logits")
+    parser.add_argument("--static-shape", action="store_true",
+                        help=f"Fixed batch sizes (1 and {STATIC_BATCH_SIZE}) instead of a dynamic batch axis")
 
     args = parser.parse_args()
-    export_to_onnx(args.model, args.output, args.max_seq_len, args.light)
+    if args.fp16 and args.quantize != "none":
+        parser.error("--fp16 and --quantize are mutually exclusive")
+    export_to_onnx(args.model, args.output, args.max_seq_len, args.light, args.quantize, args.fp16,
+                   args.static_shape, args.argmax)
 
 
 if __name__ == "__main__":
@@ -40,10 +40,12 @@ Key Features:
 - Cross-attention allows each slot to focus on relevant input parts
 """
 
+import math
+import os
+
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
-import math
 from typing import Dict, Tuple, Optional
 
 
@@ -54,11 +56,38 @@ NUM_MODES = 8           # Mode/subtype variants
 NUM_REGISTERS = 32      # r0-r31
 IMM_BINS = 256          # Quantized immediate values
 
+# Prediction heads in output order, with their class counts
+HEAD_NAMES = ('valid', 'opcode', 'mode', 'rd', 'rs1', 'rs2', 'has_imm', 'imm_bin')
+HEAD_SIZES = (2, NUM_OPCODES, NUM_MODES, NUM_REGISTERS, NUM_REGISTERS, NUM_REGISTERS, 2, IMM_BINS)
+
+# Entries of the loss vector returned by ParallelInstructionLoss
+LOSS_NAMES = HEAD_NAMES + ('total',)
+
+
+def fused_heads(x: torch.Tensor, heads) -> Dict[str, torch.Tensor]:
+    """
+    Apply the prediction heads as one GEMM.
+
+    The per-head nn.Linear modules stay the parameter owners (so checkpoints
+    are unchanged); their weights are concatenated into a single
+    (sum(HEAD_SIZES), hidden) matrix and the output is split back per head.
+    """
+    weight = torch.cat([head.weight for head in heads])
+    bias = torch.cat([head.bias for head in heads])
+    logits = F.linear(x, weight, bias).split(HEAD_SIZES, dim=-1)
+    return dict(zip(HEAD_NAMES, logits))
+
 
 class PositionalEncoding(nn.Module):
-    """Sinusoidal positional encoding."""
+    """
+    Sinusoidal positional encoding.
+
+    With seq_len set, inputs must be exactly that long and the encoding is
+    added from a pre-sliced buffer, so traced/exported graphs see a constant
+    instead of a size-dependent slice.
+    """
 
-    def __init__(self, d_model: int, max_len: int = 512):
+    def __init__(self, d_model: int, max_len: int = 512, seq_len: Optional[int] = None):
         super().__init__()
         pe = torch.zeros(max_len, d_model)
         position = torch.arange(0, max_len, dtype=torch.float).unsqueeze(1)
@@ -67,8 +96,16 @@ class PositionalEncoding(nn.Module):
         pe[:, 1::2] = torch.cos(position * div_term)
         self.register_buffer('pe', pe.unsqueeze(0))  # (1, max_len, d_model)
 
+        # Derived from pe, so kept out of the state_dict
+        self.seq_len = seq_len
+        if seq_len is not None:
+            assert seq_len <= max_len
+            self.register_buffer('pe_fixed', self.pe[:, :seq_len].clone(), persistent=False)
+
     def forward(self, x: torch.Tensor) -> torch.Tensor:
         # x: (batch, seq_len, d_model)
+        if self.seq_len is not None:
+            return x + self.pe_fixed
         return x + self.pe[:, :x.size(1)]
 
 
@@ -93,25 +130,107 @@ class MultiHeadCrossAttention(nn.Module):
         query: torch.Tensor,   # (batch, num_slots, d_model)
         key: torch.Tensor,     # (batch, seq_len, d_model)
         value: torch.Tensor,   # (batch, seq_len, d_model)
+        kv: Optional[Tuple[torch.Tensor, torch.Tensor]] = None,
     ) -> torch.Tensor:
-        batch_size = query.size(0)
+        return self.forward_fixed_q(self.q_proj(query), key, value, kv)
+
+    def project_kv(
+        self,
+        key: torch.Tensor,     # (batch, seq_len, d_model)
+        value: torch.Tensor,   # (batch, seq_len, d_model)
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Project keys and values to (batch, num_heads, seq_len, head_dim).
+
+        For self-sourced K/V (key is value, as with the encoder output) both
+        projections run as one GEMM over the concatenated k_proj/v_proj
+        weights, whose output is split back into K and V.
+        """
+        batch_size = key.size(0)
+        if key is value:
+            weight = torch.cat([self.k_proj.weight, self.v_proj.weight])
+            bias = torch.cat([self.k_proj.bias, self.v_proj.bias])
+            k, v = F.linear(key, weight, bias).chunk(2, dim=-1)
+        else:
+            k, v = self.k_proj(key), self.v_proj(value)
+        k = k.view(batch_size, -1, self.num_heads, self.head_dim).transpose(1, 2)
+        v = v.view(batch_size, -1, self.num_heads, self.head_dim).transpose(1, 2)
+        return k, v
+
+    def forward_fixed_q(
+        self,
+        q: torch.Tensor,       # (batch or 1, num_slots, d_model), already q_proj'd
+        key: torch.Tensor,     # (batch, seq_len, d_model)
+        value: torch.Tensor,   # (batch, seq_len, d_model)
+        kv: Optional[Tuple[torch.Tensor, torch.Tensor]] = None,
+    ) -> torch.Tensor:
+        """
+        Attend with pre-projected queries.
+
+        For input-independent queries (the learned slot queries) the Q
+        projection can be done once on a (1, num_slots, d_model) tensor and
+        broadcast over the batch instead of repeated per sample. kv, if
+        given, is a project_kv() result to use instead of key/value.
+        """
+        batch_size = key.size(0)
 
         # Project
-        q = self.q_proj(query).view(batch_size, -1, self.num_heads, self.head_dim).transpose(1, 2)
-        k = self.k_proj(key).view(batch_size, -1, self.num_heads, self.head_dim).transpose(1, 2)
-        v = self.v_proj(value).view(batch_size, -1, self.num_heads, self.head_dim).transpose(1, 2)
-
-        # Attention
-        scores = torch.matmul(q, k.transpose(-2, -1)) / math.sqrt(self.head_dim)
-        attn = F.softmax(scores, dim=-1)
-        attn = self.dropout(attn)
-
-        # Combine
-        out = torch.matmul(attn, v)
-        out = out.transpose(1, 2).contiguous().view(batch_size, -1, self.d_model)
+        q = q.view(q.size(0), -1, self.num_heads, self.head_dim).transpose(1, 2)
+        q = q.expand(batch_size, -1, -1, -1)
+        k, v = kv if kv is not None else self.project_kv(key, value)
+
+        # Attention (fused kernel: Flash / memory-efficient on GPU, math on CPU)
+        out = F.scaled_dot_product_attention(
+            q, k, v, dropout_p=self.dropout.p if self.training else 0.0,
+        )
+
+        # Combine (SDPA kernels typically return a transposed view of a
+        # (batch, slots, heads, head_dim) buffer, so this reshape is free)
+        out = out.transpose(1, 2).reshape(batch_size, -1, self.d_model)
         return self.out_proj(out)
 
 
+class BatchNormFoldedConv1d(nn.Module):
+    """
+    Conv1d with the BatchNorm1d that feeds it folded into its weights.
+
+    The encoder runs Conv1d -> GELU -> BatchNorm1d -> Conv1d, so in eval mode
+    the BatchNorm is a per-channel affine map (scale, shift) on the next
+    convolution's input and can be absorbed by that convolution:
+        W' = W * scale,  b' = b + sum(W * shift)
+    The zero padding of the original convolution pads the BatchNorm output,
+    not its input, so the first and last positions would otherwise pick up a
+    shift term from the padded taps; that term is subtracted back out.
+    """
+
+    def __init__(self, bn: nn.BatchNorm1d, conv: nn.Conv1d):
+        super().__init__()
+        assert conv.kernel_size == (3,) and conv.padding == (1,) and conv.stride == (1,)
+
+        scale = bn.weight / torch.sqrt(bn.running_var + bn.eps)
+        shift = bn.bias - bn.running_mean * scale
+        shifted = conv.weight * shift[None, :, None]  # (out, in, kernel)
+
+        self.conv = nn.Conv1d(
+            conv.in_channels, conv.out_channels, kernel_size=3, padding=1,
+            device=conv.weight.device, dtype=conv.weight.dtype,
+        )
+        self.conv.weight.data.copy_(conv.weight * scale[None, :, None])
+        self.conv.bias.data.copy_(conv.bias + shifted.sum(dim=(1, 2)))
+        # Per-tap shift contribution: column 0 is what the left pad would
+        # have added at the first position, column 2 the right pad at the last
+        self.register_buffer('edge', shifted.sum(dim=1).detach())  # (out, kernel)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        # x: (batch, channels, seq_len), seq_len >= 2
+        out = self.conv(x)
+        return torch.cat([
+            out[:, :, :1] - self.edge[:, :1],
+            out[:, :, 1:-1],
+            out[:, :, -1:] - self.edge[:, 2:],
+        ], dim=2)
+
+
 class ParallelInstructionModel(nn.Module):
     """
     Parallel instruction prediction model.
@@ -132,26 +251,38 @@ class ParallelInstructionModel(nn.Module):
         num_heads: int = 8,
         dropout: float = 0.1,
         max_seq_len: int = 512,
+        fixed_seq_len: Optional[int] = None,
+        norm: str = 'batch',
+        share_kv: bool = False,
     ):
         super().__init__()
+        assert norm in ('batch', 'group')
 
         self.vocab_size = vocab_size
         self.embed_dim = embed_dim
         self.hidden_dim = hidden_dim
         self.num_slots = num_slots
+        self.norm = norm
+        self.share_kv = share_kv
 
         # Encoder
         self.embedding = nn.Embedding(vocab_size, embed_dim, padding_idx=256)
-        self.pos_encoding = PositionalEncoding(embed_dim, max_seq_len)
+        self.pos_encoding = PositionalEncoding(embed_dim, max_seq_len, fixed_seq_len)
+
+        # CNN encoder with increasing channels. 'group' normalizes per sample
+        # (no cross-batch statistics); 'batch' matches released checkpoints
+        def encoder_norm(channels: int) -> nn.Module:
+            if norm == 'group':
+                return nn.GroupNorm(32, channels)
+            return nn.BatchNorm1d(channels)
 
-        # CNN encoder with increasing channels
         self.encoder = nn.Sequential(
             nn.Conv1d(embed_dim, 256, kernel_size=3, padding=1),
             nn.GELU(),
-            nn.BatchNorm1d(256),
+            encoder_norm(256),
             nn.Conv1d(256, 512, kernel_size=3, padding=1),
             nn.GELU(),
-            nn.BatchNorm1d(512),
+            encoder_norm(512),
             nn.Conv1d(512, hidden_dim, kernel_size=3, padding=1),
             nn.GELU(),
         )
@@ -168,6 +299,12 @@ class ParallelInstructionModel(nn.Module):
             nn.LayerNorm(hidden_dim) for _ in range(2)
         ])
 
+        # Both layers attend to the same encoder output; with share_kv they
+        # also share the K/V projections, so K/V is computed once per forward
+        if share_kv:
+            self.cross_attention[1].k_proj = self.cross_attention[0].k_proj
+            self.cross_attention[1].v_proj = self.cross_attention[0].v_proj
+
         # Feed-forward after cross-attention
         self.ffn = nn.Sequential(
             nn.Linear(hidden_dim, hidden_dim * 4),
@@ -218,24 +355,63 @@ class ParallelInstructionModel(nn.Module):
         # Expand slot queries for batch
         slots = self.slot_queries.expand(batch_size, -1, -1)  # (batch, num_slots, hidden)
 
-        # Cross-attention layers
-        for attn, norm in zip(self.cross_attention, self.layer_norms):
-            slots = norm(slots + attn(slots, encoded, encoded))
+        # Cross-attention layers. The first layer's queries are the learned
+        # slot queries, the same for every sample, so project them once
+        first_attn, first_norm = self.cross_attention[0], self.layer_norms[0]
+        kv = first_attn.project_kv(encoded, encoded) if self.share_kv else None
+        slot_q = first_attn.q_proj(self.slot_queries)  # (1, num_slots, hidden)
+        slots = first_norm(slots + first_attn.forward_fixed_q(slot_q, encoded, encoded, kv))
+        for attn, norm in zip(self.cross_attention[1:], self.layer_norms[1:]):
+            slots = norm(slots + attn(slots, encoded, encoded, kv))
 
         # Feed-forward
         slots = self.ffn_norm(slots + self.ffn(slots))
 
         # Parallel prediction heads
-        return {
-            'valid': self.valid_head(slots),
-            'opcode': self.opcode_head(slots),
-            'mode': self.mode_head(slots),
-            'rd': self.rd_head(slots),
-            'rs1': self.rs1_head(slots),
-            'rs2': self.rs2_head(slots),
-            'has_imm': self.has_imm_head(slots),
-            'imm_bin': self.imm_head(slots),
-        }
+        return fused_heads(slots, (
+            self.valid_head,
+            self.opcode_head,
+            self.mode_head,
+            self.rd_head,
+            self.rs1_head,
+            self.rs2_head,
+            self.has_imm_head,
+            self.imm_head,
+        ))
+
+    @torch.no_grad()
+    def fuse_for_inference(self) -> 'ParallelInstructionModel':
+        """
+        Fold the encoder's BatchNorm layers into the following Conv1d.
+
+        Removes both BatchNorm passes (and their intermediate tensors) from
+        the inference graph. Uses the running statistics, so call it on a
+        trained model in eval mode, after loading weights; the fused model's
+        state_dict no longer matches training checkpoints. GroupNorm depends
+        on per-sample statistics and cannot be folded, so with norm='group'
+        only the embedding is simplified.
+
+        The embedding's padding_idx only matters for gradients; the padding
+        row is zeroed explicitly and the attribute dropped so the lookup is
+        a plain gather.
+        """
+        assert not self.training, "fuse_for_inference() requires eval mode"
+        if self.embedding.padding_idx is not None:
+            self.embedding.weight[self.embedding.padding_idx].zero_()
+            self.embedding.padding_idx = None
+
+        if self.norm != 'batch':
+            return self
+        conv1, gelu1, bn1, conv2, gelu2, bn2, conv3, gelu3 = self.encoder
+        self.encoder = nn.Sequential(
+            conv1,
+            gelu1,
+            BatchNormFoldedConv1d(bn1, conv2),
+            gelu2,
+            BatchNormFoldedConv1d(bn2, conv3),
+            gelu3,
+        )
+        return self
 
     def predict(
         self,
@@ -291,52 +467,121 @@ class ParallelInstructionLoss(nn.Module):
             'imm_bin': imm_weight,
         }
 
-        self.ce_loss = nn.CrossEntropyLoss(reduction='none')
+        # Per-head weights in HEAD_NAMES order, as a (heads,) vector
+        self.register_buffer(
+            'head_weights',
+            torch.tensor([self.weights[name] for name in HEAD_NAMES]),
+            persistent=False,
+        )
+        self.max_classes = max(HEAD_SIZES)
 
     def forward(
         self,
         logits: Dict[str, torch.Tensor],
         targets: Dict[str, torch.Tensor],
-    ) -> Tuple[torch.Tensor, Dict[str, float]]:
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
         """
         Compute combined loss.
 
+        Heads share a cross-entropy call: logits are padded with -inf up to
+        the widest head (padding gets zero probability) and stacked.
+
         Args:
             logits: Dict of (batch, num_slots, num_classes) tensors
-            targets: Dict of (batch, num_slots) tensors
+            targets: Dict of (batch, num_slots) tensors, optionally with
+                'valid_indices' (see valid_slot_indices()) so the slot heads
+                only evaluate valid slots instead of masking padded ones
 
         Returns:
             total_loss: Scalar loss
-            losses: Dict of individual loss values for logging
+            losses: Detached (len(LOSS_NAMES),) vector of per-head and total
+                loss, left on device; see losses_to_dict()
         """
-        losses = {}
-        total_loss = 0.0
+        valid_indices = targets.get('valid_indices')
+        if valid_indices is None:
+            head_losses = self._masked_head_losses(logits, targets)
+        else:
+            head_losses = self._packed_head_losses(logits, targets, valid_indices)
 
-        # Get valid mask from targets
+        total_loss = (head_losses * self.head_weights).sum()
+
+        # Kept on device so callers decide when to sync
+        losses = torch.cat([head_losses, total_loss.unsqueeze(0)]).detach()
+        return total_loss, losses
+
+    def _pad_classes(self, logit: torch.Tensor) -> torch.Tensor:
+        """Pad the class dim to max_classes with -inf."""
+        return F.pad(logit, (0, self.max_classes - logit.size(-1)), value=float('-inf'))
+
+    def _masked_head_losses(
+        self,
+        logits: Dict[str, torch.Tensor],
+        targets: Dict[str, torch.Tensor],
+    ) -> torch.Tensor:
+        """Per-head losses over all slots, with padded slots masked out."""
+        stacked = torch.stack([self._pad_classes(logits[name]) for name in HEAD_NAMES])
+        stacked_targets = torch.stack([targets[name] for name in HEAD_NAMES])
+
+        # float32 log-softmax even when the logits come from bf16/fp16 autocast
+        loss = F.cross_entropy(
+            stacked.reshape(-1, self.max_classes).float(),
+            stacked_targets.reshape(-1),
+            reduction='none',
+        ).view(stacked_targets.shape)  # (heads, batch, num_slots)
+
+        # Mask invalid slots (except for 'valid' head which we always train)
         valid_mask = targets['valid'].float()  # (batch, num_slots)
+        mask = torch.cat([
+            torch.ones_like(valid_mask).unsqueeze(0),
+            valid_mask.expand(len(HEAD_NAMES) - 1, -1, -1),
+        ])
 
-        for name in ['valid', 'opcode', 'mode', 'rd', 'rs1', 'rs2', 'has_imm', 'imm_bin']:
-            # Reshape for cross-entropy: (batch * slots, classes) vs (batch * slots)
-            logit = logits[name].view(-1, logits[name].size(-1))
-            target = targets[name].view(-1)
+        # Average over the (valid) slots of each head
+        return (loss * mask).sum(dim=(1, 2)) / (mask.sum(dim=(1, 2)) + 1e-8)
 
-            # Compute per-element loss
-            loss = self.ce_loss(logit, target)
-            loss = loss.view(targets[name].shape)  # (batch, num_slots)
+    def _packed_head_losses(
+        self,
+        logits: Dict[str, torch.Tensor],
+        targets: Dict[str, torch.Tensor],
+        valid_indices: torch.Tensor,
+    ) -> torch.Tensor:
+        """Per-head losses with the slot heads gathered to valid slots only."""
+        # The 'valid' head always trains on every slot; its rows go first and
+        # the gathered slot-head rows follow, all in one cross-entropy call
+        rows = [self._pad_classes(logits['valid'].reshape(-1, logits['valid'].size(-1)))]
+        row_targets = [targets['valid'].reshape(-1)]
+        slot_heads = HEAD_NAMES[1:]
+        for name in slot_heads:
+            rows.append(self._pad_classes(logits[name].reshape(-1, logits[name].size(-1))[valid_indices]))
+            row_targets.append(targets[name].reshape(-1)[valid_indices])
+
+        loss = F.cross_entropy(
+            torch.cat(rows).float(),
+            torch.cat(row_targets),
+            reduction='none',
+        )
+        num_slots = row_targets[0].numel()
+        valid_loss = loss[:num_slots].mean()
 
-            # Mask invalid slots (except for 'valid' head which we always train)
-            if name != 'valid':
-                loss = loss * valid_mask
-                # Average over valid slots only
-                loss = loss.sum() / (valid_mask.sum() + 1e-8)
-            else:
-                loss = loss.mean()
+        # num_valid is a shape, so this needs no device sync
+        num_valid = valid_indices.numel()
+        slot_losses = loss[num_slots:].view(len(slot_heads), num_valid).sum(dim=1) / max(num_valid, 1)
+        return torch.cat([valid_loss.unsqueeze(0), slot_losses])
 
-            losses[name] = loss.item()
-            total_loss = total_loss + self.weights[name] * loss
 
-        losses['total'] = total_loss.item()
-        return total_loss, losses
+def valid_slot_indices(valid: torch.Tensor) -> torch.Tensor:
+    """
+    Flat indices of the valid slots in a (batch, num_slots) valid target.
+
+    Meant to be computed on the data-loader side and passed to
+    ParallelInstructionLoss as targets['valid_indices'].
+    """
+    return valid.reshape(-1).nonzero().squeeze(1)
+
+
+def losses_to_dict(losses: torch.Tensor) -> Dict[str, float]:
+    """Convert a loss vector from ParallelInstructionLoss to {name: value} (one sync)."""
+    return dict(zip(LOSS_NAMES, losses.tolist()))
 
 
 class LightParallelModel(nn.Module):
@@ -395,12 +640,31 @@ class LightParallelModel(nn.Module):
         slots = self.slot_proj(features).view(batch_size, self.num_slots, -1)
 
         # Predict
-        return {name: head(slots) for name, head in self.heads.items()}
+        return fused_heads(slots, [self.heads[name] for name in HEAD_NAMES])
 
     def count_parameters(self) -> int:
         return sum(p.numel() for p in self.parameters() if p.requires_grad)
 
 
+def compile_model(
+    model: nn.Module,
+    mode: str = 'reduce-overhead',
+    cache_dir: Optional[str] = None,
+) -> nn.Module:
+    """
+    Compile a model with torch.compile for fixed input shapes.
+
+    'reduce-overhead' (CUDA graphs) suits training at a fixed batch size,
+    'max-autotune' fixed-shape inference. cache_dir sets
+    TORCHINDUCTOR_CACHE_DIR (unless already set) so compiled and autotuned
+    kernels are reused across runs. The returned wrapper's state_dict keys
+    carry an '_orig_mod.' prefix; save checkpoints from the original model.
+    """
+    if cache_dir is not None:
+        os.environ.setdefault('TORCHINDUCTOR_CACHE_DIR', cache_dir)
+    return torch.compile(model, mode=mode, dynamic=False)
+
+
 if __name__ == "__main__":
     # Test models
     print("Testing ParallelInstructionModel...")
@@ -445,5 +709,5 @@ if __name__ == "__main__":
     loss, losses = criterion(output, targets)
     print(f"Total loss: {loss.item():.4f}")
     print("Individual losses:")
-    for name, value in losses.items():
+    for name, value in losses_to_dict(losses).items():
         print(f"  {name}: {value:.4f}")
@@ -8,12 +8,17 @@ Usage:
 """
 
 import argparse
+import os
 import sys
 from pathlib import Path
 import numpy as np
 
+# Idle OpenMP threads sleep instead of spin-waiting between runs; must be set
+# before torch/onnxruntime load their OpenMP runtime
+os.environ.setdefault('OMP_WAIT_POLICY', 'PASSIVE')
+
 sys.path.insert(0, str(Path(__file__).parent))
-from model import ParallelInstructionModel, NUM_SLOTS, NUM_OPCODES
+from model import ParallelInstructionModel, HEAD_NAMES, NUM_OPCODES, NUM_REGISTERS, IMM_BINS
 
 # Opcode names for display
 OPCODE_NAMES = [
@@ -27,35 +32,67 @@ OPCODE_NAMES = [
 # Register names
 REGISTER_NAMES = [f"r{i}" for i in range(31)] + ["zero"]
 
+# Lookup tables covering every class a head can predict, for vectorized decode
+_OPCODE_TABLE = np.array(
+    OPCODE_NAMES + [f"OP{i}" for i in range(len(OPCODE_NAMES), NUM_OPCODES)], dtype=object
+)
+_REGISTER_TABLE = np.array(
+    REGISTER_NAMES + [f"r{i}" for i in range(len(REGISTER_NAMES), NUM_REGISTERS)], dtype=object
+)
+# Immediate from bin (centered around 128 = 0)
+_IMM_TABLE = np.array([f"#{b - 128}" for b in range(IMM_BINS)], dtype=object)
+
+
+def tokenize(texts: list, max_len: int = 256) -> np.ndarray:
+    """Convert texts to a (len(texts), max_len) batch of token IDs (byte-level)."""
+    tokens = np.full((len(texts), max_len), 256, dtype=np.int64)  # 256 = padding
+    for i, text in enumerate(texts):
+        bytes_data = text.encode('utf-8')[:max_len]
+        tokens[i, :len(bytes_data)] = np.frombuffer(bytes_data, dtype=np.uint8)
+    return tokens
+
+
+def decode_instructions(preds: dict) -> list:
+    """
+    Decode one program's per-slot predictions to human-readable instructions.
+
+    preds maps each head name to a (num_slots,) array of class indices;
+    invalid slots are dropped.
+    """
+    slots = np.flatnonzero(preds['valid'])
+    opnames = _OPCODE_TABLE[preds['opcode'][slots]]
+    rd_names = _REGISTER_TABLE[preds['rd'][slots]]
+    rs1_names = _REGISTER_TABLE[preds['rs1'][slots]]
+    # Third operand is the immediate when present, else rs2
+    last = np.where(
+        preds['has_imm'][slots] != 0,
+        _IMM_TABLE[preds['imm_bin'][slots]],
+        _REGISTER_TABLE[preds['rs2'][slots]],
+    )
+    return [
+        f"{op}.{mode} {rd}, {rs1}, {operand}"
+        for op, mode, rd, rs1, operand in zip(
+            opnames, preds['mode'][slots].tolist(), rd_names, rs1_names, last
+        )
+    ]
 
-def tokenize(text: str, max_len: int = 256) -> np.ndarray:
-    """Convert text to token IDs (byte-level)."""
-    bytes_data = text.encode('utf-8')[:max_len]
-    tokens = list(bytes_data)
-
-    # Pad to max_len
-    if len(tokens) < max_len:
-        tokens = tokens + [256] * (max_len - len(tokens))
-
-    return np.array([tokens], dtype=np.int64)
 
+def print_predictions(prompts: list, preds: dict):
+    """Decode and print each prompt's program from (batch, num_slots) predictions."""
+    for j, prompt in enumerate(prompts):
+        print(f"Prompt: '{prompt}'")
+        print("-" * 50)
 
-def decode_instruction(valid, opcode, mode, rd, rs1, rs2, has_imm, imm_bin) -> str:
-    """Decode instruction to human-readable format."""
-    if not valid:
-        return None
+        instructions = decode_instructions({name: preds[name][j] for name in HEAD_NAMES})
 
-    opname = OPCODE_NAMES[opcode] if opcode < len(OPCODE_NAMES) else f"OP{opcode}"
-    rd_name = REGISTER_NAMES[rd] if rd < len(REGISTER_NAMES) else f"r{rd}"
-    rs1_name = REGISTER_NAMES[rs1] if rs1 < len(REGISTER_NAMES) else f"r{rs1}"
-    rs2_name = REGISTER_NAMES[rs2] if rs2 < len(REGISTER_NAMES) else f"r{rs2}"
+        if instructions:
+            print(f"Generated {len(instructions)} instructions:")
+            for i, instr in enumerate(instructions):
+                print(f"  {i:02d}: {instr}")
+        else:
+            print("No valid instructions generated")
 
-    if has_imm:
-        # Decode immediate from bin (centered around 128 = 0)
-        imm = imm_bin - 128
-        return f"{opname}.{mode} {rd_name}, {rs1_name}, #{imm}"
-    else:
-        return f"{opname}.{mode} {rd_name}, {rs1_name}, {rs2_name}"
+        print()
 
 
 def test_pytorch_inference(model_path: str, prompts: list):
@@ -77,49 +114,35 @@ def test_pytorch_inference(model_path: str, prompts: list):
     print(f"Model parameters: {model.count_parameters():,}")
     print()
 
-    for prompt in prompts:
-        print(f"Prompt: '{prompt}'")
-        print("-" * 50)
+    # All prompts in one forward pass
+    tokens = torch.from_numpy(tokenize(prompts))
 
-        tokens = torch.tensor(tokenize(prompt), dtype=torch.long)
-
-        with torch.no_grad():
-            output = model.predict(tokens)
-
-        # Decode instructions
-        valid = output['valid'][0].numpy()
-        opcode = output['opcode'][0].numpy()
-        mode = output['mode'][0].numpy()
-        rd = output['rd'][0].numpy()
-        rs1 = output['rs1'][0].numpy()
-        rs2 = output['rs2'][0].numpy()
-        has_imm = output['has_imm'][0].numpy()
-        imm_bin = output['imm_bin'][0].numpy()
-
-        instructions = []
-        for i in range(NUM_SLOTS):
-            instr = decode_instruction(
-                valid[i], opcode[i], mode[i], rd[i], rs1[i], rs2[i], has_imm[i], imm_bin[i]
-            )
-            if instr:
-                instructions.append(instr)
+    with torch.inference_mode():
+        output = model.predict(tokens)
 
-        if instructions:
-            print(f"Generated {len(instructions)} instructions:")
-            for i, instr in enumerate(instructions):
-                print(f"  {i:02d}: {instr}")
-        else:
-            print("No valid instructions generated")
+    print_predictions(prompts, {name: output[name].numpy() for name in HEAD_NAMES})
 
-        print()
+
+def create_onnx_session(model_path: str):
+    """
+    CPU InferenceSession with full graph optimization and one intra-op
+    thread per core; ops run sequentially and idle threads don't spin.
+    """
+    import onnxruntime as ort
+
+    opts = ort.SessionOptions()
+    opts.intra_op_num_threads = os.cpu_count() or 1
+    opts.inter_op_num_threads = 1
+    opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    opts.add_session_config_entry('session.intra_op.allow_spinning', '0')
+    return ort.InferenceSession(model_path, opts, providers=['CPUExecutionProvider'])
 
 
 def test_onnx_inference(model_path: str, prompts: list):
     """Test inference with ONNX model."""
-    import onnxruntime as ort
-
     print(f"Loading ONNX model from {model_path}...")
-    session = ort.InferenceSession(model_path, providers=['CPUExecutionProvider'])
+    session = create_onnx_session(model_path)
 
     # Print model info
     inputs = session.get_inputs()
@@ -128,45 +151,29 @@ def test_onnx_inference(model_path: str, prompts: list):
     print(f"Outputs: {[o.name for o in outputs]}")
     print()
 
-    for prompt in prompts:
-        print(f"Prompt: '{prompt}'")
-        print("-" * 50)
-
-        tokens = tokenize(prompt)
-
-        # Run inference
-        result = session.run(None, {'input_ids': tokens})
-
-        # Outputs are in order: valid, opcode, mode, rd, rs1, rs2, has_imm, imm_bin
-        valid_logits, opcode_logits, mode_logits, rd_logits, rs1_logits, rs2_logits, has_imm_logits, imm_bin_logits = result
-
-        # Get predictions (argmax)
-        valid = np.argmax(valid_logits[0], axis=-1)
-        opcode = np.argmax(opcode_logits[0], axis=-1)
-        mode = np.argmax(mode_logits[0], axis=-1)
-        rd = np.argmax(rd_logits[0], axis=-1)
-        rs1 = np.argmax(rs1_logits[0], axis=-1)
-        rs2 = np.argmax(rs2_logits[0], axis=-1)
-        has_imm = np.argmax(has_imm_logits[0], axis=-1)
-        imm_bin = np.argmax(imm_bin_logits[0], axis=-1)
-
-        # Decode instructions
-        instructions = []
-        for i in range(NUM_SLOTS):
-            instr = decode_instruction(
-                valid[i], opcode[i], mode[i], rd[i], rs1[i], rs2[i], has_imm[i], imm_bin[i]
-            )
-            if instr:
-                instructions.append(instr)
-
-        if instructions:
-            print(f"Generated {len(instructions)} instructions:")
-            for i, instr in enumerate(instructions):
-                print(f"  {i:02d}: {instr}")
-        else:
-            print("No valid instructions generated")
-
-        print()
+    tokens = tokenize(prompts)
+
+    # Run all prompts in one session.run; --static-shape exports have a fixed
+    # batch size, so feed those in padded chunks of that size
+    batch_size = inputs[0].shape[0]
+    if not isinstance(batch_size, int):
+        batch_size = len(tokens)
+    chunks = []
+    for start in range(0, len(tokens), batch_size):
+        chunk = tokens[start:start + batch_size]
+        n = len(chunk)
+        if n < batch_size:
+            padding = np.full((batch_size - n, chunk.shape[1]), 256, dtype=np.int64)
+            chunk = np.concatenate([chunk, padding])
+        chunks.append([out[:n] for out in session.run(None, {'input_ids': chunk})])
+    result = [np.concatenate(parts) for parts in zip(*chunks)]
+
+    # Outputs are in HEAD_NAMES order: valid, opcode, mode, rd, rs1, rs2, has_imm, imm_bin
+    # Get predictions (argmax), unless exported with --argmax
+    print_predictions(prompts, {
+        name: np.argmax(out, axis=-1) if out.ndim == 3 else out
+        for name, out in zip(HEAD_NAMES, result)
+    })
 
 
 def main():
@@ -15,23 +15,45 @@ import argparse
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from collections import defaultdict
 
+import numpy as np
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from torch.utils.data import Dataset, DataLoader, random_split
+from torch.utils.data import Dataset, DataLoader, default_collate, random_split
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from parallel.model import (
     ParallelInstructionModel,
     LightParallelModel,
     ParallelInstructionLoss,
+    losses_to_dict,
+    valid_slot_indices,
+    compile_model,
+    HEAD_NAMES,
+    LOSS_NAMES,
     NUM_SLOTS,
+    NUM_OPCODES,
+    NUM_MODES,
+    NUM_REGISTERS,
 )
 
+# Per-head upper clamp for targets, in HEAD_NAMES order (valid/has_imm unclamped)
+TARGET_MAX = np.array([
+    np.iinfo(np.int64).max, NUM_OPCODES - 1, NUM_MODES - 1,
+    NUM_REGISTERS - 1, NUM_REGISTERS - 1, NUM_REGISTERS - 1,
+    np.iinfo(np.int64).max, 255,
+], dtype=np.int64)
+
 
 class ParallelDataset(Dataset):
     """Dataset for parallel instruction prediction training."""
@@ -48,13 +70,15 @@ class ParallelDataset(Dataset):
         self.samples = []
         self.categories = defaultdict(int)
 
-        with open(data_path, 'r') as f:
+        # Lines are parsed as bytes; orjson when available, else json
+        loads = orjson.loads if orjson is not None else json.loads
+        with open(data_path, 'rb') as f:
             for i, line in enumerate(f):
                 if max_samples and i >= max_samples:
                     break
 
                 try:
-                    item = json.loads(line)
+                    item = loads(line)
                     # Support both 'context' (new format) and 'prompt' (old format)
                     text = item.get('context') or item.get('prompt', '')
                     instructions = item.get('instructions', [])
@@ -78,75 +102,95 @@ class ParallelDataset(Dataset):
         for cat, count in sorted(self.categories.items(), key=lambda x: -x[1]):
             print(f"  {cat}: {count} ({count/len(self.samples):.1%})")
 
+        self._encode_samples()
+        # The encoded tensors are all training needs; dropping the parsed
+        # dicts keeps forked workers from copying them page by page as
+        # refcount updates dirty copy-on-write memory
+        del self.samples
+
+    def _encode_samples(self):
+        """
+        Tokenize and build targets for every sample once, up front.
+
+        Stored compactly as int16 (tokens are 0-256, clamped targets 0-255)
+        in one (N, max_seq_len) token tensor and one (N, heads, num_slots)
+        target tensor, so __getitem__ is just row indexing.
+        """
+        n = len(self.samples)
+        tokens = np.full((n, self.max_seq_len), 256, dtype=np.int16)  # 256 = padding
+        targets = np.zeros((n, len(HEAD_NAMES), self.num_slots), dtype=np.int16)  # 0 = padding
+
+        for i, sample in enumerate(self.samples):
+            # Tokenize text (simple byte-level)
+            raw = np.frombuffer(sample['text'].encode('utf-8')[:self.max_seq_len], dtype=np.uint8)
+            tokens[i, :raw.size] = raw
+
+        # Targets for all samples at once: one flat (total_instructions, heads)
+        # array, clamped in a single pass and scattered to (sample, :, slot)
+        instructions = [sample['instructions'][:self.num_slots] for sample in self.samples]
+        counts = np.fromiter(map(len, instructions), dtype=np.int64, count=n)
+        fields = np.fromiter(
+            (instr.get(name, 0) for sample in instructions for instr in sample for name in HEAD_NAMES),
+            dtype=np.int64,
+            count=int(counts.sum()) * len(HEAD_NAMES),
+        ).reshape(-1, len(HEAD_NAMES))
+        # Convert to unsigned: negative values (backward branches) become 256+val
+        fields[:, -1] %= 256  # numpy % floors like Python: -24 % 256 = 232
+        np.minimum(fields, TARGET_MAX, out=fields)  # Clamp to valid range
+
+        sample_idx = np.repeat(np.arange(n), counts)
+        slot_idx = np.arange(len(fields)) - np.repeat(np.cumsum(counts) - counts, counts)
+        targets[sample_idx, :, slot_idx] = fields
+
+        # Shared memory, so every DataLoader worker maps the same pages
+        self.tokens = torch.from_numpy(tokens).share_memory_()
+        self.targets = torch.from_numpy(targets).share_memory_()
+
     def __len__(self) -> int:
-        return len(self.samples)
+        return len(self.tokens)
 
     def __getitem__(self, idx: int) -> Dict[str, torch.Tensor]:
-        sample = self.samples[idx]
-
-        # Tokenize text (simple byte-level)
-        text_bytes = sample['text'].encode('utf-8')[:self.max_seq_len]
-        tokens = list(text_bytes)
-
-        # Pad to max_seq_len
-        if len(tokens) < self.max_seq_len:
-            tokens = tokens + [256] * (self.max_seq_len - len(tokens))  # 256 = padding
-
-        # Process instructions (pad to num_slots)
-        instructions = sample['instructions'][:self.num_slots]
-
-        # Initialize targets with zeros (padding)
-        targets = {
-            'valid': [0] * self.num_slots,
-            'opcode': [0] * self.num_slots,
-            'mode': [0] * self.num_slots,
-            'rd': [0] * self.num_slots,
-            'rs1': [0] * self.num_slots,
-            'rs2': [0] * self.num_slots,
-            'has_imm': [0] * self.num_slots,
-            'imm_bin': [0] * self.num_slots,
-        }
-
-        # Fill in actual instructions
-        for i, instr in enumerate(instructions):
-            if i >= self.num_slots:
-                break
-            targets['valid'][i] = instr.get('valid', 0)
-            targets['opcode'][i] = min(instr.get('opcode', 0), 32)  # Clamp to valid range
-            targets['mode'][i] = min(instr.get('mode', 0), 7)
-            targets['rd'][i] = min(instr.get('rd', 0), 31)
-            targets['rs1'][i] = min(instr.get('rs1', 0), 31)
-            targets['rs2'][i] = min(instr.get('rs2', 0), 31)
-            targets['has_imm'][i] = instr.get('has_imm', 0)
-            # Convert to unsigned: negative values (backward branches) become 256+val
-            imm = instr.get('imm_bin', 0)
-            targets['imm_bin'][i] = imm % 256  # Python % handles negatives: -24 % 256 = 232
-
         return {
-            'tokens': torch.tensor(tokens, dtype=torch.long),
-            'valid': torch.tensor(targets['valid'], dtype=torch.long),
-            'opcode': torch.tensor(targets['opcode'], dtype=torch.long),
-            'mode': torch.tensor(targets['mode'], dtype=torch.long),
-            'rd': torch.tensor(targets['rd'], dtype=torch.long),
-            'rs1': torch.tensor(targets['rs1'], dtype=torch.long),
-            'rs2': torch.tensor(targets['rs2'], dtype=torch.long),
-            'has_imm': torch.tensor(targets['has_imm'], dtype=torch.long),
-            'imm_bin': torch.tensor(targets['imm_bin'], dtype=torch.long),
-            'category': sample['category'],
+            'tokens': self.tokens[idx].long(),
+            'targets': self.targets[idx].long(),  # (heads, num_slots), HEAD_NAMES order
         }
 
 
 def collate_fn(batch: List[Dict]) -> Dict[str, torch.Tensor]:
-    """Custom collate function to handle dict batches."""
-    result = {}
-    for key in batch[0].keys():
-        if key == 'category':
-            result[key] = [item[key] for item in batch]
-        else:
-            result[key] = torch.stack([item[key] for item in batch])
+    """default_collate (one stack per fixed-shape field) plus valid-slot indices."""
+    result = default_collate(batch)
+    # Lets the loss gather valid slots instead of masking padded ones
+    result['valid_indices'] = valid_slot_indices(result['targets'][:, 0])
     return result
 
 
+def batch_to_device(
+    batch: Dict[str, torch.Tensor],
+    device: torch.device,
+) -> Tuple[torch.Tensor, Dict[str, torch.Tensor]]:
+    """
+    Move a collated batch to device as (tokens, targets dict).
+
+    Targets travel as one stacked (batch, heads, num_slots) tensor and are
+    split into per-head views on device. non_blocking copies are async from
+    the pinned loader memory.
+    """
+    tokens = batch['tokens'].to(device, non_blocking=True)
+    stacked = batch['targets'].to(device, non_blocking=True)
+    targets = dict(zip(HEAD_NAMES, stacked.unbind(1)))
+    targets['valid_indices'] = batch['valid_indices'].to(device, non_blocking=True)
+    return tokens, targets
+
+
+def autocast(device: torch.device, precision: str = 'fp32'):
+    """
+    Autocast context for a --precision value: fp16/bf16 run matmuls and
+    convolutions in half precision with float32 weights; fp32 is a no-op.
+    """
+    dtype = {'fp16': torch.float16, 'bf16': torch.bfloat16}.get(precision)
+    return torch.autocast(device.type, dtype=dtype or torch.bfloat16, enabled=dtype is not None)
+
+
 def train_epoch(
     model: nn.Module,
     loader: DataLoader,
@@ -154,59 +198,87 @@ def train_epoch(
     optimizer: optim.Optimizer,
     device: torch.device,
     scaler: Optional[torch.amp.GradScaler] = None,
+    precision: str = 'fp32',
+    log_interval: int = 50,
 ) -> Dict[str, float]:
-    """Train for one epoch."""
+    """Train for one epoch.
+
+    fp16 needs a scaler for loss scaling; bf16 has float32's exponent range
+    and runs without one. The progress bar shows the current batch's losses
+    every log_interval steps (each update syncs with the device).
+    """
     model.train()
 
-    total_losses = defaultdict(float)
+    # Accumulated on device and synced once after the loop
+    loss_sum = torch.zeros(len(LOSS_NAMES), device=device)
     num_batches = 0
 
     pbar = tqdm(loader, desc="Training")
     for batch in pbar:
-        tokens = batch['tokens'].to(device)
-
-        # Prepare targets dict
-        targets = {
-            'valid': batch['valid'].to(device),
-            'opcode': batch['opcode'].to(device),
-            'mode': batch['mode'].to(device),
-            'rd': batch['rd'].to(device),
-            'rs1': batch['rs1'].to(device),
-            'rs2': batch['rs2'].to(device),
-            'has_imm': batch['has_imm'].to(device),
-            'imm_bin': batch['imm_bin'].to(device),
-        }
+        tokens, targets = batch_to_device(batch, device)
 
-        optimizer.zero_grad()
+        optimizer.zero_grad(set_to_none=True)
 
         # Forward pass (with optional mixed precision)
+        with autocast(device, precision):
+            logits = model(tokens)
+            loss, losses = criterion(logits, targets)
+
         if scaler is not None:
-            with torch.amp.autocast('cuda'):
-                logits = model(tokens)
-                loss, losses = criterion(logits, targets)
             scaler.scale(loss).backward()
             scaler.unscale_(optimizer)
             torch.nn.utils.clip_grad_norm_(model.parameters(), 1.0)
             scaler.step(optimizer)
             scaler.update()
         else:
-            logits = model(tokens)
-            loss, losses = criterion(logits, targets)
             loss.backward()
             torch.nn.utils.clip_grad_norm_(model.parameters(), 1.0)
             optimizer.step()
 
         # Accumulate losses
-        for k, v in losses.items():
-            total_losses[k] += v
+        loss_sum += losses
         num_batches += 1
 
-        pbar.set_postfix({
-            'loss': f"{losses['total']:.4f}",
-            'op': f"{losses['opcode']:.4f}",
-        })
+        if num_batches % log_interval == 0:
+            losses = losses_to_dict(losses)
+            pbar.set_postfix({
+                'loss': f"{losses['total']:.4f}",
+                'op': f"{losses['opcode']:.4f}",
+            })
+
+    return {k: v / num_batches for k, v in losses_to_dict(loss_sum).items()}
+
+
+def warmup_compiled(
+    model: nn.Module,
+    loader: DataLoader,
+    criterion: ParallelInstructionLoss,
+    device: torch.device,
+    precision: str = 'fp32',
+):
+    """
+    Trigger torch.compile for the train and eval graphs on one batch, so
+    compile time is not attributed to the first epoch.
+
+    Runs forward/backward without an optimizer step and restores buffers
+    (BatchNorm running stats), leaving the model as it was.
+    """
+    tokens, targets = batch_to_device(next(iter(loader)), device)
+    buffers = [b.detach().clone() for b in model.buffers()]
+
+    model.train()
+    with autocast(device, precision):
+        loss, _ = criterion(model(tokens), targets)
+    loss.backward()
+    model.zero_grad(set_to_none=True)
 
-    return {k: v / num_batches for k, v in total_losses.items()}
+    model.eval()
+    with torch.inference_mode():
+        criterion(model(tokens), targets)
+
+    with torch.no_grad():
+        for b, saved in zip(model.buffers(), buffers):
+            b.copy_(saved)
 
 
 def evaluate(
@@ -218,57 +290,56 @@ def evaluate(
     """Evaluate model."""
     model.eval()
 
-    total_losses = defaultdict(float)
-    correct_valid = 0
-    correct_opcode = 0
-    total_valid = 0
-    total_slots = 0
+    # Accumulated on device and synced once after the loop
+    loss_sum = torch.zeros(len(LOSS_NAMES), device=device)
+    # correct_valid, total_slots, correct_opcode, total_valid
+    acc = torch.zeros(4, dtype=torch.long, device=device)
 
-    with torch.no_grad():
+    with torch.inference_mode():
         for batch in tqdm(loader, desc="Evaluating"):
-            tokens = batch['tokens'].to(device)
-
-            targets = {
-                'valid': batch['valid'].to(device),
-                'opcode': batch['opcode'].to(device),
-                'mode': batch['mode'].to(device),
-                'rd': batch['rd'].to(device),
-                'rs1': batch['rs1'].to(device),
-                'rs2': batch['rs2'].to(device),
-                'has_imm': batch['has_imm'].to(device),
-                'imm_bin': batch['imm_bin'].to(device),
-            }
+            tokens, targets = batch_to_device(batch, device)
 
             # Forward pass
             logits = model(tokens)
             _, losses = criterion(logits, targets)
-
-            # Accumulate losses
-            for k, v in losses.items():
-                total_losses[k] += v
+            loss_sum += losses
 
             # Compute accuracy
             valid_pred = torch.argmax(logits['valid'], dim=-1)
             opcode_pred = torch.argmax(logits['opcode'], dim=-1)
 
             # Valid prediction accuracy (all slots)
-            correct_valid += (valid_pred == targets['valid']).sum().item()
-            total_slots += tokens.size(0) * valid_pred.size(1)
+            acc[0] += (valid_pred == targets['valid']).sum()
+            acc[1] += valid_pred.numel()
 
             # Opcode accuracy (only for valid slots)
             valid_mask = targets['valid'] == 1
-            if valid_mask.sum() > 0:
-                correct_opcode += ((opcode_pred == targets['opcode']) & valid_mask).sum().item()
-                total_valid += valid_mask.sum().item()
+            acc[2] += ((opcode_pred == targets['opcode']) & valid_mask).sum()
+            acc[3] += valid_mask.sum()
 
     num_batches = len(loader)
-    avg_losses = {k: v / num_batches for k, v in total_losses.items()}
+    avg_losses = {k: v / num_batches for k, v in losses_to_dict(loss_sum).items()}
+    correct_valid, total_slots, correct_opcode, total_valid = acc.tolist()
     avg_losses['valid_acc'] = correct_valid / max(1, total_slots)
     avg_losses['opcode_acc'] = correct_opcode / max(1, total_valid)
 
     return avg_losses
 
 
+def cpu_snapshot(state: Any) -> Any:
+    """
+    Copy every tensor in a (nested) state dict to CPU, so it can be saved
+    in the background while training keeps updating the originals.
+    """
+    if isinstance(state, torch.Tensor):
+        return state.detach().to('cpu', copy=True)
+    if isinstance(state, dict):
+        return {k: cpu_snapshot(v) for k, v in state.items()}
+    if isinstance(state, (list, tuple)):
+        return type(state)(cpu_snapshot(v) for v in state)
+    return state
+
+
 def main():
     parser = argparse.ArgumentParser(description="Train parallel instruction model")
     parser.add_argument('--data', type=str, required=True, help="Training data JSONL file")
@@ -279,12 +350,30 @@ def main():
     parser.add_argument('--val-split', type=float, default=0.1, help="Validation split")
     parser.add_argument('--save-dir', type=str, default=None, help="Save directory (derived from --output if not set)")
     parser.add_argument('--light', action='store_true', help="Use lightweight model")
+    parser.add_argument('--norm', choices=['batch', 'group'], default='batch',
+                        help="Encoder normalization (group avoids cross-batch statistics)")
+    parser.add_argument('--share-kv', action='store_true',
+                        help="Share K/V projections between the cross-attention layers")
     parser.add_argument('--device', type=str, default='cuda' if torch.cuda.is_available() else 'cpu')
     parser.add_argument('--max-samples', type=int, default=None, help="Max training samples")
     parser.add_argument('--max-seq-len', type=int, default=256, help="Max sequence length")
     parser.add_argument('--patience', type=int, default=5, help="Early stopping patience")
-    parser.add_argument('--mixed-precision', action='store_true', help="Use mixed precision training")
+    precision = parser.add_mutually_exclusive_group()
+    precision.add_argument('--precision', choices=['fp32', 'fp16', 'bf16'], default='fp32',
+                           help="Training precision: fp16 autocast with loss scaling, or bf16 "
+                                "autocast without (Ampere+ GPUs); weights stay fp32")
+    precision.add_argument('--mixed-precision', dest='precision', action='store_const', const='fp16',
+                           help="Same as --precision fp16")
+    precision.add_argument('--bf16', dest='precision', action='store_const', const='bf16',
+                           help="Same as --precision bf16")
+    parser.add_argument('--compile', action='store_true',
+                        help="torch.compile the model (reduce-overhead mode, fixed shapes)")
+    parser.add_argument('--compile-cache', type=str, default=None,
+                        help="Persistent TorchInductor cache directory for --compile")
     parser.add_argument('--num-workers', type=int, default=4, help="DataLoader workers")
+    parser.add_argument('--log-interval', type=int, default=50,
+                        help="Steps between progress-bar loss updates")
+    parser.add_argument('--prefetch-factor', type=int, default=4, help="Batches prefetched per DataLoader worker")
     parser.add_argument('--checkpoint', type=str, default=None, help="Checkpoint to resume from (for fine-tuning)")
     args = parser.parse_args()
 
@@ -297,6 +386,12 @@ def main():
     device = torch.device(args.device)
     print(f"Using device: {device}")
 
+    if device.type == 'cuda':
+        # Shapes are fixed, so cuDNN's autotuned algorithms are picked once
+        # and reused; 'high' allows TF32 matmuls on Ampere+
+        torch.backends.cudnn.benchmark = True
+        torch.set_float32_matmul_precision('high')
+
     # Create save directory
     save_dir = Path(args.save_dir)
     save_dir.mkdir(exist_ok=True)
@@ -313,22 +408,19 @@ def main():
     train_size = len(dataset) - val_size
     train_dataset, val_dataset = random_split(dataset, [train_size, val_size])
 
-    train_loader = DataLoader(
-        train_dataset,
+    loader_kwargs = dict(
         batch_size=args.batch_size,
-        shuffle=True,
-        num_workers=args.num_workers,
-        pin_memory=True if args.device == 'cuda' else False,
-        collate_fn=collate_fn,
-    )
-    val_loader = DataLoader(
-        val_dataset,
-        batch_size=args.batch_size,
-        shuffle=False,
         num_workers=args.num_workers,
         pin_memory=True if args.device == 'cuda' else False,
         collate_fn=collate_fn,
     )
+    if args.num_workers > 0:
+        # Keep workers alive across epochs and queue more batches per worker
+        loader_kwargs.update(persistent_workers=True, prefetch_factor=args.prefetch_factor)
+    # Compiled graphs are specialized to the batch shape; drop the ragged
+    # last batch so training never recompiles
+    train_loader = DataLoader(train_dataset, shuffle=True, drop_last=args.compile, **loader_kwargs)
+    val_loader = DataLoader(val_dataset, shuffle=False, **loader_kwargs)
 
     print(f"\nTrain samples: {len(train_dataset)}, Val samples: {len(val_dataset)}")
 
@@ -336,7 +428,8 @@ def main():
     if args.light:
         model = LightParallelModel()
     else:
-        model = ParallelInstructionModel(max_seq_len=args.max_seq_len)
+        model = ParallelInstructionModel(max_seq_len=args.max_seq_len, norm=args.norm,
+                                         share_kv=args.share_kv)
 
     # Load checkpoint for fine-tuning if provided
     start_epoch = 0
@@ -355,13 +448,28 @@ def main():
     model = model.to(device)
     print(f"Model parameters: {model.count_parameters():,}")
 
+    # Train/evaluate through the compiled wrapper; checkpoints are saved
+    # from `model` so their keys stay unprefixed
+    run_model = compile_model(model, cache_dir=args.compile_cache) if args.compile else model
+
     # Loss and optimizer
-    criterion = ParallelInstructionLoss()
+    criterion = ParallelInstructionLoss().to(device)
     optimizer = optim.AdamW(model.parameters(), lr=args.lr, weight_decay=0.01)
     scheduler = optim.lr_scheduler.CosineAnnealingLR(optimizer, T_max=args.epochs)
 
-    # Mixed precision scaler
-    scaler = torch.amp.GradScaler('cuda') if args.mixed_precision and args.device == 'cuda' else None
+    # Mixed precision scaler (fp16 autocast is CUDA-only here)
+    if args.precision == 'fp16' and args.device != 'cuda':
+        args.precision = 'fp32'
+    scaler = torch.amp.GradScaler('cuda') if args.precision == 'fp16' else None
+
+    if args.compile:
+        print("Compiling model...")
+        warmup_compiled(run_model, train_loader, criterion, device, args.precision)
+
+    # Best-model checkpoints are written by a background thread while the
+    # next epoch trains; one worker keeps saves in order
+    save_pool = ThreadPoolExecutor(max_workers=1)
+    pending_save = None
 
     # Training loop
     best_val_loss = float('inf')
@@ -372,13 +480,14 @@ def main():
         print(f"\nEpoch {epoch + 1}/{args.epochs}")
 
         # Train
-        train_losses = train_epoch(model, train_loader, criterion, optimizer, device, scaler)
+        train_losses = train_epoch(run_model, train_loader, criterion, optimizer, device, scaler,
+                                   args.precision, args.log_interval)
         print(f"Train - Loss: {train_losses['total']:.4f}, "
               f"Opcode: {train_losses['opcode']:.4f}, "
               f"Valid: {train_losses['valid']:.4f}")
 
         # Evaluate
-        val_losses = evaluate(model, val_loader, criterion, device)
+        val_losses = evaluate(run_model, val_loader, criterion, device)
         print(f"Val - Loss: {val_losses['total']:.4f}, "
               f"Valid Acc: {val_losses['valid_acc']:.4f}, "
               f"Opcode Acc: {val_losses['opcode_acc']:.4f}")
@@ -389,14 +498,16 @@ def main():
             best_val_loss = val_losses['total']
             patience_counter = 0
 
-            checkpoint = {
+            checkpoint = cpu_snapshot({
                 'epoch': epoch,
                 'model_state_dict': model.state_dict(),
                 'optimizer_state_dict': optimizer.state_dict(),
                 'val_loss': best_val_loss,
                 'opcode_acc': best_opcode_acc,
-            }
-            torch.save(checkpoint, save_dir / 'best_model.pt')
+            })
+            if pending_save is not None:
+                pending_save.result()  # Surface errors from the previous save
+            pending_save = save_pool.submit(torch.save, checkpoint, save_dir / 'best_model.pt')
             print(f"  -> Saved best model (opcode_acc: {best_opcode_acc:.4f})")
         else:
             patience_counter += 1
@@ -406,6 +517,10 @@ def main():
 
         scheduler.step()
 
+    save_pool.shutdown(wait=True)
+    if pending_save is not None:
+        pending_save.result()
+
     # Save final model to output path
     output_path = Path(args.output)
     torch.save(model.state_dict(), output_path.with_suffix('.pt'))
@@ -416,6 +531,9 @@ def main():
     config = {
         'model_type': 'light' if args.light else 'full',
         'max_seq_len': args.max_seq_len,
+        'norm': args.norm,
+        'share_kv': args.share_kv,
+        'precision': args.precision,
         'best_opcode_acc': best_opcode_acc,
         'best_val_loss': best_val_loss,
         'epochs_trained': epoch + 1,